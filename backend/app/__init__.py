@@ -1,25 +1,29 @@
 from flask import Flask
 from flask_cors import CORS
-from .config import init_config
+from .config import CORS_ORIGINS, init_config
+from .cli import register_cli
+from .utils.auth import init_auth
+from .utils.json_provider import MongoJSONProvider
+from .utils.metrics import init_metrics
 
 def create_app():
     app = Flask(__name__)
+    app.json = MongoJSONProvider(app)
     # Allow specific frontend origins for API routes with credentials support
     CORS(
         app,
         supports_credentials=True,
         resources={
             r"/api/*": {
-                "origins": [
-                    "http://localhost:5173",
-                    "http://127.0.0.1:5173",
-                    "https://myexpensetracker-six.vercel.app",
-                ]
+                "origins": CORS_ORIGINS
             }
         },
     )
 
     init_config(app)
+    register_cli(app)
+    init_metrics(app)
+    init_auth(app)
 
     # Register API blueprints
     try:
@@ -41,6 +45,21 @@ def create_app():
         from app.routes.profile_routes import profile_bp
         app.register_blueprint(profile_bp)
 
+        from app.routes.analytics_routes import analytics_bp
+        app.register_blueprint(analytics_bp)
+
+        from app.routes.dashboard_routes import dashboard_bp
+        app.register_blueprint(dashboard_bp)
+
+        from app.routes.sync_routes import sync_bp
+        app.register_blueprint(sync_bp)
+
+        from app.routes.events_routes import events_bp
+        app.register_blueprint(events_bp)
+
+        from app.routes.jobs_routes import jobs_bp
+        app.register_blueprint(jobs_bp)
+
         # Legacy auth (token POST) can remain registered or be omitted; new conventional flow below
         try:
             from app.routes.auth_routes import auth_bp
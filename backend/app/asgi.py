@@ -0,0 +1,268 @@
+"""Optional async (ASGI) serving mode.
+
+The read-heavy endpoints below are served natively on asyncio with Motor, so a
+single worker can hold many concurrent dashboards. Every other request,
+including CORS preflights and all writes, is forwarded to the regular Flask app
+in a thread, so both modes share one codebase and the same JSON contracts.
+
+Needs the extras in requirements-async.txt; run with e.g.
+``uvicorn asgi:app --workers 4`` from the backend directory.
+"""
+import asyncio
+import os
+
+from asgiref.wsgi import WsgiToAsgi
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from app import create_app
+from app.config import CORS_ORIGINS, client_options, db, event_listeners
+from app.routes.events_routes import SSE_HEADERS
+from app.services.analytics_service import (
+    analytics_payload,
+    assemble_analytics,
+    expense_pipeline,
+    get_period_bounds,
+    savings_pipeline,
+)
+from app.services.expense_service import build_summary, summary_start_day
+from app.services.rollup_service import category_totals_query, fold_category_totals
+from app.services.savings_service import (
+    BALANCE_PROJECTION,
+    PREDATES_BALANCES,
+    balance_view,
+    ledger_pipeline,
+    totals_from_ledger,
+)
+from app.services.settings_service import cached_settings, remember_settings, settings_view
+from app.utils.cache import MISSING
+from app.utils.events import EVENTS_HEARTBEAT_SECONDS, HEARTBEAT, RESYNC, AsyncSubscription, hub, open_stream
+from app.utils.pagination import finish_page, page_filter, page_sort, parse_limit
+from app.utils.response import error_payload, success_payload
+from app.utils.serializers import EXPENSE_PROJECTION, SAVINGS_PROJECTION, serialize_documents
+from app.utils.versioning import compute_etag, version_of
+
+
+_motor = {"pid": None, "client": None}
+_flask_app = None
+
+
+def _adb():
+    """Motor database for this process, created inside the running event loop."""
+    if _motor["pid"] != os.getpid():
+        _motor["client"] = AsyncIOMotorClient(
+            os.getenv("MONGO_URI"), event_listeners=list(event_listeners), **client_options()
+        )
+        _motor["pid"] = os.getpid()
+    return _motor["client"][db.name]
+
+
+def _json(payload, code: int = 200) -> Response:
+    # Same provider and formatting as jsonify, so both modes emit identical bodies
+    body = _flask_app.json.response(payload).get_data()
+    return Response(body, status_code=code, media_type="application/json")
+
+
+async def _get_version(token: str):
+    record = await _adb().data_versions.find_one({"token": token}, {"_id": 0, "v": 1, "changed_at": 1})
+    return version_of(record)
+
+
+def conditional(handler):
+    """Async counterpart of app.utils.versioning.conditional."""
+    async def wrapper(request):
+        token = request.query_params.get("token")
+        if not token:
+            return await handler(request, token)
+
+        full_path = f"{request.url.path}?{request.url.query}"
+        # Like g.data_version: cached reads for this body must match the tag
+        request.state.data_version = await _get_version(token)
+        if request.state.data_version is None:
+            return await handler(request, token)
+        etag = f'"{compute_etag(full_path, request.state.data_version)}"'
+        if etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+            resp = Response(status_code=304)
+        else:
+            resp = await handler(request, token)
+            if resp.status_code != 200:
+                return resp
+        resp.headers["ETag"] = etag
+        resp.headers["Cache-Control"] = "private, no-cache"
+        return resp
+
+    return wrapper
+
+
+async def _settings(token: str, version: int = None):
+    record = cached_settings(token, version)
+    if record is MISSING:
+        record = await _adb().settings.find_one({"token": token}, {"_id": 0})
+        remember_settings(token, record, version)
+    return dict(record) if record else None
+
+
+async def _balance(token: str) -> dict:
+    adb = _adb()
+    record = await adb.savings_balances.find_one({"token": token}, BALANCE_PROJECTION)
+    if record is None:
+        pipeline = ledger_pipeline(token, PREDATES_BALANCES)
+        record = totals_from_ledger(await adb.savings.aggregate(pipeline).to_list(None))
+        try:
+            result = await adb.savings_balances.update_one({"token": token}, {"$setOnInsert": record}, upsert=True)
+        except DuplicateKeyError:
+            result = None  # a concurrent upsert created it first
+        if result is not None and result.upserted_id is not None:
+            # Same as get_balance: the seeded balance is new derived data
+            await adb.data_versions.update_one({"token": token}, {"$inc": {"v": 1}}, upsert=True)
+    return balance_view(record)
+
+
+async def _page(request, token: str, collection: str, sort_field: str, projection: dict):
+    """One keyset page as (docs, next_cursor), or a ready 400 response."""
+    limit, err = parse_limit(request.query_params.get("limit"))
+    if err:
+        return None, _json(error_payload(err), 400)
+    try:
+        q = page_filter({"token": token}, sort_field, request.query_params.get("after"))
+    except ValueError as e:
+        return None, _json(error_payload(str(e)), 400)
+    docs = await _adb()[collection].find(q, projection).sort(page_sort(sort_field)).limit(limit + 1).to_list(None)
+    return finish_page(docs, limit, sort_field), None
+
+
+@conditional
+async def list_expenses(request, token):
+    if not token:
+        return _json(error_payload("token is required"), 400)
+    page, resp = await _page(request, token, "expenses", "created_at", EXPENSE_PROJECTION)
+    if resp:
+        return resp
+    docs, next_cursor = page
+    items = serialize_documents(docs)
+    return _json(success_payload("Expenses fetched", items, next_cursor=next_cursor))
+
+
+@conditional
+async def expense_summary(request, token):
+    if not token:
+        return _json(error_payload("token is required"), 400)
+    period = (request.query_params.get("period") or "week").lower()
+    q, projection = category_totals_query(token, summary_start_day(period))
+    settings, rows = await asyncio.gather(
+        _settings(token, request.state.data_version),
+        _adb().daily_rollups.find(q, projection).to_list(None),
+    )
+    payload = build_summary(fold_category_totals(rows), (settings or {}).get("budget"))
+    return _json(success_payload("Summary fetched", payload))
+
+
+@conditional
+async def savings_get(request, token):
+    if not token:
+        return _json(error_payload("token is required"), 400)
+    page, resp = await _page(request, token, "savings", "occurred_at", SAVINGS_PROJECTION)
+    if resp:
+        return resp
+    docs, next_cursor = page
+    items = serialize_documents(docs)
+    return _json(success_payload("Savings fetched", items, next_cursor=next_cursor))
+
+
+@conditional
+async def savings_summary(request, token):
+    if not token:
+        return _json(error_payload("token is required"), 400)
+    return _json(success_payload("Summary fetched", await _balance(token)))
+
+
+@conditional
+async def settings_get(request, token):
+    try:
+        if not token:
+            return _json(error_payload("token is required"), 400)
+        return _json({"success": True, "data": settings_view(await _settings(token, request.state.data_version))})
+    except Exception as e:
+        return _json(error_payload(str(e)), 500)
+
+
+async def analytics(request):
+    try:
+        token = request.query_params.get("token")
+        chart_type = request.query_params.get("chart_type")
+        if not token:
+            return _json(error_payload("Token is missing"), 404)
+        if chart_type not in ("line", "pie"):
+            return _json(error_payload("Invalid type parameter"), 400)
+
+        start_day = get_period_bounds(request.query_params.get("period")).date().isoformat()
+        rollups = _adb().daily_rollups
+        settings, expense_rows, savings_rows, balance = await asyncio.gather(
+            _settings(token),
+            rollups.aggregate(expense_pipeline(token, start_day)).to_list(None),
+            rollups.aggregate(savings_pipeline(token, start_day)).to_list(None),
+            _balance(token),
+        )
+        result = assemble_analytics(expense_rows, savings_rows, balance)
+        return _json(analytics_payload(chart_type, settings, result))
+    except Exception as e:
+        return _json(error_payload(str(e)), 500)
+
+
+async def events(request):
+    """Async /api/events: an open stream costs a coroutine and a small queue."""
+    token = request.query_params.get("token")
+    if not token:
+        return _json(error_payload("token is required"), 400)
+    sub = open_stream(token, AsyncSubscription())
+
+    async def stream():
+        try:
+            yield HEARTBEAT
+            while True:
+                message = await sub.get(EVENTS_HEARTBEAT_SECONDS)
+                if sub.overflowed:
+                    yield RESYNC
+                    return
+                yield message or HEARTBEAT
+        finally:
+            hub.unsubscribe(token, sub)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+ASYNC_ROUTES = [
+    Route("/api/expenses/list", list_expenses),
+    Route("/api/expenses/summary", expense_summary),
+    Route("/api/savings/get", savings_get),
+    Route("/api/savings/summary", savings_summary),
+    Route("/api/settings/get", settings_get),
+    Route("/api/analytics", analytics),
+    Route("/api/events", events),
+]
+
+
+def create_asgi_app():
+    """ASGI entry point: async GET routes above, everything else via Flask."""
+    global _flask_app
+    _flask_app = create_app()
+    wsgi = WsgiToAsgi(_flask_app)
+    native = Starlette(
+        routes=ASYNC_ROUTES,
+        middleware=[Middleware(CORSMiddleware, allow_origins=CORS_ORIGINS, allow_credentials=True)],
+    )
+    native_paths = {r.path for r in ASYNC_ROUTES}
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await native(scope, receive, send)
+        if scope["type"] == "http" and scope["method"] == "GET" and scope["path"] in native_paths:
+            return await native(scope, receive, send)
+        return await wsgi(scope, receive, send)
+
+    return app
@@ -3,15 +3,17 @@ from urllib.parse import urlencode
 from flask import Blueprint, redirect, request
 import requests
 from app.config import db
+from app.utils.http_client import timed_request
 import uuid
 from datetime import datetime
 
 
 google_auth_bp = Blueprint('google_auth_bp', __name__, url_prefix='/api/auth/google')
 
-GOOGLE_AUTH_URL = 'https://accounts.google.com/o/oauth2/v2/auth'
-GOOGLE_TOKEN_URL = 'https://oauth2.googleapis.com/token'
-GOOGLE_USERINFO_URL = 'https://www.googleapis.com/oauth2/v2/userinfo'
+# Overridable so a local stub can stand in for Google in tests and benchmarks
+GOOGLE_AUTH_URL = os.getenv('GOOGLE_AUTH_URL', 'https://accounts.google.com/o/oauth2/v2/auth')
+GOOGLE_TOKEN_URL = os.getenv('GOOGLE_TOKEN_URL', 'https://oauth2.googleapis.com/token')
+GOOGLE_USERINFO_URL = os.getenv('GOOGLE_USERINFO_URL', 'https://www.googleapis.com/oauth2/v2/userinfo')
 
 
 def _get_env(name, default=None):
@@ -62,7 +64,10 @@ def callback():
         'redirect_uri': redirect_uri,
         'grant_type': 'authorization_code',
     }
-    token_resp = requests.post(GOOGLE_TOKEN_URL, data=data, timeout=15)
+    try:
+        token_resp = timed_request('google_token', 'POST', GOOGLE_TOKEN_URL, data=data)
+    except requests.RequestException as e:
+        return (f"Failed to reach Google token endpoint: {e}", 502)
     if token_resp.status_code != 200:
         try:
             body = token_resp.json()
@@ -76,11 +81,15 @@ def callback():
         return ('Missing access_token in token response', 400)
 
     # Fetch profile
-    ui_resp = requests.get(
-        GOOGLE_USERINFO_URL,
-        headers={'Authorization': f'Bearer {access_token}'},
-        timeout=15,
-    )
+    try:
+        ui_resp = timed_request(
+            'google_userinfo',
+            'GET',
+            GOOGLE_USERINFO_URL,
+            headers={'Authorization': f'Bearer {access_token}'},
+        )
+    except requests.RequestException as e:
+        return (f"Failed to reach Google userinfo endpoint: {e}", 502)
     if ui_resp.status_code != 200:
         try:
             body = ui_resp.json()
@@ -98,12 +107,6 @@ def callback():
     if not email:
         return ('Email not available from Google profile', 400)
 
-    # Ensure unique index on google_id
-    try:
-        db.users.create_index('google_id', unique=True)
-    except Exception:
-        pass
-
     # Upsert user by google_id and manage access_token
     users = db.users
     record = users.find_one({'google_id': google_id})
@@ -0,0 +1,113 @@
+import os
+import re
+import threading
+import time
+
+from google.auth import exceptions, jwt
+
+from app.utils.http_client import timed_request
+
+
+# Overridable so a local stand-in can serve test keys
+GOOGLE_CERTS_URL = os.getenv('GOOGLE_CERTS_URL', 'https://www.googleapis.com/oauth2/v1/certs')
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+
+DEFAULT_MAX_AGE = 3600
+# Refresh in the background once this fraction of the max-age has elapsed
+REFRESH_AT = 0.8
+# Forced refetches (unknown kid) happen at most this often per process; anyone
+# can post a token with a made-up kid, so each must not cost a download
+MIN_FORCED_REFRESH_SECONDS = float(os.getenv('GOOGLE_CERTS_MIN_REFRESH_SECONDS', '60'))
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+class CertCache:
+    """Google's id_token signing certs, cached for the Cache-Control max-age.
+
+    Once a set is cached callers never wait on Google: from REFRESH_AT of the
+    max-age on, one background thread refreshes it while everyone keeps using
+    the current set, even past expiry (Google keeps serving retired keys for a
+    while). Only the first login of the process waits, and concurrent first
+    logins share one fetch.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._certs = None
+        self._fetched_at = 0.0
+        self._max_age = 0
+        self._lock = threading.Lock()
+        self._initial_lock = threading.Lock()
+        self._forced_lock = threading.Lock()
+        self._refreshing = False
+
+    def _fetch(self):
+        resp = timed_request('google_certs', 'GET', self.url)
+        resp.raise_for_status()
+        match = _MAX_AGE_RE.search(resp.headers.get('Cache-Control', ''))
+        max_age = int(match.group(1)) if match else DEFAULT_MAX_AGE
+        with self._lock:
+            self._certs = resp.json()
+            self._fetched_at = time.monotonic()
+            self._max_age = max_age
+
+    def _start_refresh(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, daemon=True).start()
+
+    def _background_refresh(self):
+        try:
+            self._fetch()
+        except Exception:
+            # Keep serving the current set; the next call starts another attempt
+            pass
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _initial_fetch(self):
+        with self._initial_lock:
+            if self._certs is None:
+                self._fetch()
+
+    def _forced_fetch(self):
+        # One thread fetches; the rest wait and reuse its result
+        with self._forced_lock:
+            if time.monotonic() - self._fetched_at >= MIN_FORCED_REFRESH_SECONDS:
+                self._fetch()
+
+    def get(self, force: bool = False) -> dict:
+        if self._certs is None:
+            self._initial_fetch()
+        elif force:
+            self._forced_fetch()
+        elif time.monotonic() - self._fetched_at >= self._max_age * REFRESH_AT:
+            self._start_refresh()
+        return self._certs
+
+
+cert_cache = CertCache(GOOGLE_CERTS_URL)
+
+
+def verify_google_id_token(credential, audience):
+    """Drop-in for ``id_token.verify_oauth2_token`` backed by ``cert_cache``.
+
+    A token signed with a key we have not seen yet (Google rotated keys) forces
+    a refetch, unless the certs were fetched within MIN_FORCED_REFRESH_SECONDS;
+    then the unknown kid is rejected by ``jwt.decode``.
+    """
+    if isinstance(credential, bytes):
+        credential = credential.decode('utf-8')
+    certs = cert_cache.get()
+    if jwt.decode_header(credential).get('kid') not in certs:
+        certs = cert_cache.get(force=True)
+    idinfo = jwt.decode(credential, certs=certs, audience=audience)
+    if idinfo.get('iss') not in GOOGLE_ISSUERS:
+        raise exceptions.GoogleAuthError(
+            "Wrong issuer. 'iss' should be one of the following: {}".format(GOOGLE_ISSUERS)
+        )
+    return idinfo
@@ -0,0 +1,119 @@
+import click
+
+
+def register_cli(app):
+    """Attach maintenance commands to ``flask --app run <command>``."""
+
+    @app.cli.group("indexes")
+    def indexes_group():
+        """Manage MongoDB indexes."""
+
+    @indexes_group.command("ensure")
+    def indexes_ensure():
+        """Create any missing indexes from the manifest."""
+        from app.config import db
+        from app.indexes import ensure_indexes
+
+        failures = ensure_indexes(db)
+        for coll, name, err in failures:
+            click.echo(f"FAILED {coll}.{name}: {err}")
+        if failures:
+            raise SystemExit(1)
+        click.echo("All indexes present")
+
+    @indexes_group.command("verify")
+    def indexes_verify():
+        """Report indexes that are missing or have never been used."""
+        from app.config import db
+        from app.indexes import verify_indexes
+
+        report = verify_indexes(db)
+        for coll, name in report["missing"]:
+            click.echo(f"MISSING {coll}.{name}")
+        for coll, name in report["unused"]:
+            click.echo(f"UNUSED  {coll}.{name}")
+        if not report["missing"] and not report["unused"]:
+            click.echo("OK")
+        if report["missing"]:
+            raise SystemExit(1)
+
+    @app.cli.group("rollups")
+    def rollups_group():
+        """Manage the daily_rollups summary collection."""
+
+    @rollups_group.command("rebuild")
+    @click.option("--token", default=None, help="Rebuild a single user instead of everyone.")
+    def rollups_rebuild(token):
+        """Recompute daily rollups from raw expenses and savings."""
+        from app.services.rollup_service import rebuild_rollups
+
+        count = rebuild_rollups(token)
+        click.echo(f"Rebuilt rollups for {count} user(s)")
+
+    @app.cli.group("migrate")
+    def migrate_group():
+        """Online data migrations."""
+
+    @migrate_group.command("occurred-at")
+    @click.option("--batch-size", default=1000, show_default=True)
+    @click.option("--restart", is_flag=True, help="Ignore the saved checkpoint and scan from the start.")
+    def migrate_occurred_at(batch_size, restart):
+        """Backfill the canonical occurred_at field on expenses and savings."""
+        from app.config import db
+        from app.migrations import LEDGER_COLLECTIONS, backfill_occurred_at
+
+        for coll in LEDGER_COLLECTIONS:
+            if restart:
+                db.migrations.delete_one({"_id": f"occurred_at:{coll}"})
+            stats = backfill_occurred_at(db, coll, batch_size, log=click.echo)
+            click.echo(f"{coll}: {stats['updated']} updated, {stats['skipped']} skipped")
+
+    @app.cli.group("savings")
+    def savings_group():
+        """Savings balance maintenance."""
+
+    @savings_group.command("reconcile")
+    @click.option("--token", default=None, help="Check a single user instead of everyone.")
+    @click.option("--fix", is_flag=True, help="Overwrite drifted balances with ledger totals.")
+    def savings_reconcile(token, fix):
+        """Check materialized savings balances against the ledger."""
+        from app.services.savings_service import reconcile_balances
+
+        mismatches = reconcile_balances(token, fix)
+        for t, stored, expected in mismatches:
+            click.echo(f"DRIFT {t}: stored={stored} ledger={expected}{' (fixed)' if fix else ''}")
+        click.echo(f"{len(mismatches)} mismatch(es)")
+        if mismatches and not fix:
+            raise SystemExit(1)
+
+    @app.cli.group("slow-queries")
+    def slow_queries_group():
+        """Inspect commands captured by the slow-query recorder."""
+
+    @slow_queries_group.command("report")
+    @click.option("--hours", default=24, show_default=True, help="Look back this many hours.")
+    @click.option("--route", default=None, help="Only queries issued by this endpoint, e.g. analytics.analytics.")
+    @click.option("--flagged", is_flag=True, help="Only explained queries flagged COLLSCAN or HIGH_SCAN_RATIO.")
+    @click.option("--limit", default=20, show_default=True)
+    def slow_queries_report(hours, route, flagged, limit):
+        """Slowest query shapes per route, with explain findings."""
+        from datetime import datetime, timedelta
+
+        from app.config import db
+        from app.utils.slow_queries import SLOW_QUERY_COLLECTION, report_pipeline
+
+        since = datetime.utcnow() - timedelta(hours=hours)
+        rows = list(db[SLOW_QUERY_COLLECTION].aggregate(report_pipeline(since, route, flagged, limit)))
+        if not rows:
+            click.echo(f"No slow queries in the last {hours}h")
+            return
+        click.echo(f"{'route':<36} {'collection':<16} {'command':<14} {'count':>6} {'avg ms':>9} "
+                   f"{'max ms':>9} {'explained':>9} {'COLLSCAN':>8} {'max ratio':>9}")
+        for row in rows:
+            key = row["_id"]
+            ratio = "-" if row.get("max_ratio") is None else f"{row['max_ratio']:.1f}"
+            click.echo(
+                f"{key.get('route') or '(no request)':<36} {key.get('collection') or '-':<16} "
+                f"{key.get('command') or '-':<14} {row['count']:>6} {row['total_ms'] / row['count']:>9.1f} "
+                f"{row['max_ms']:>9.1f} {row['explained']:>9} {row['collscans']:>8} {ratio:>9}"
+            )
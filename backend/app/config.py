@@ -1,17 +1,111 @@
 import os
+import threading
 from dotenv import load_dotenv
 from pymongo import MongoClient
 
+from app.indexes import ensure_indexes
+from app.utils.metrics import REGISTRY, CommandMetrics, snapshot_gauges
+from app.utils.pool_monitor import PoolStats
+from app.utils.slow_queries import slow_query_recorder
+
 # Load .env variables
 load_dotenv()
 
-# Global MongoDB objects
-mongo_client = None
-db = None
 GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID')
+
+# Frontend origins allowed to call /api/* with credentials
+CORS_ORIGINS = [
+    "http://localhost:5173",
+    "http://127.0.0.1:5173",
+    "https://myexpensetracker-six.vercel.app",
+]
+
+# Pool/timeouts, overridable per deployment. Size workers from /readyz pool stats.
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": ("MONGO_MAX_POOL_SIZE", 100),
+    "minPoolSize": ("MONGO_MIN_POOL_SIZE", 0),
+    "maxIdleTimeMS": ("MONGO_MAX_IDLE_TIME_MS", None),
+    "waitQueueTimeoutMS": ("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000),
+    "serverSelectionTimeoutMS": ("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000),
+    "connectTimeoutMS": ("MONGO_CONNECT_TIMEOUT_MS", 5000),
+    "socketTimeoutMS": ("MONGO_SOCKET_TIMEOUT_MS", 30000),
+}
+
+# Extra pymongo event listeners (command/pool monitoring); must be added before
+# the first query in a process since listeners are fixed at client creation.
+event_listeners = []
+pool_stats = PoolStats()
+event_listeners.append(pool_stats)
+command_metrics = CommandMetrics()
+REGISTRY.add_collector(snapshot_gauges("mongo_pool", pool_stats.snapshot, "MongoDB connection pool"))
+
+
+def client_options() -> dict:
+    opts = {}
+    for option, (env, default) in MONGO_CLIENT_OPTIONS.items():
+        raw = os.getenv(env)
+        value = int(raw) if raw else default
+        if value is not None:
+            opts[option] = value
+    return opts
+
+
+class _ProcessDatabase:
+    """Stand-in for ``mongo_client[DB_NAME]`` that connects lazily per process.
+
+    MongoClient is not fork-safe, so a client created in a pre-fork master must
+    not be reused by its workers. Each process builds its own client on first
+    use; ``from app.config import db`` keeps working unchanged.
+    """
+
+    def __init__(self):
+        self._uri = None
+        self._name = None
+        self._pid = None
+        self._client = None
+        self._lock = threading.Lock()
+
+    def configure(self, uri: str, name: str):
+        self._uri, self._name = uri, name
+
+    @property
+    def client(self) -> MongoClient:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    if self._uri is None:
+                        raise RuntimeError("init_config() has not been called")
+                    self._client = MongoClient(
+                        self._uri,
+                        event_listeners=list(event_listeners),
+                        **client_options(),
+                    )
+                    self._pid = os.getpid()
+        return self._client
+
+    @property
+    def database(self):
+        return self.client[self._name]
+
+    @property
+    def name(self):
+        return self._name
+
+    def __getitem__(self, name):
+        return self.database[name]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.database, name)
+
+
+# Global MongoDB handle, importable before init_config() runs
+db = _ProcessDatabase()
+
+
 def init_config(app):
     """Initialize MongoDB connection and attach it globally."""
-    global mongo_client, db
 
     # Read environment variables
     MONGO_URI = os.getenv("MONGO_URI")
@@ -20,8 +114,19 @@ def init_config(app):
     if not MONGO_URI:
         raise Exception("MONGO_URI is missing in .env file!")
 
-    # Connect to MongoDB
-    mongo_client = MongoClient(MONGO_URI)
-    db = mongo_client[DB_NAME]
+    # Per-collection command counts/latency for /metrics, slow-query capture
+    if command_metrics not in event_listeners:
+        event_listeners.append(command_metrics)
+    if slow_query_recorder.threshold_ms > 0 and slow_query_recorder not in event_listeners:
+        event_listeners.append(slow_query_recorder)
+
+    db.configure(MONGO_URI, DB_NAME)
+
+    print(f"[MongoDB] Configured database: {DB_NAME}")
 
-    print(f"[MongoDB] Connected to database: {DB_NAME}")
+    # Apply the index manifest once per boot instead of on hot request paths
+    try:
+        for coll, name, err in ensure_indexes(db):
+            print(f"[MongoDB] Could not create index {coll}.{name}: {err}")
+    except Exception as e:
+        print(f"[MongoDB] Index bootstrap skipped: {e}")
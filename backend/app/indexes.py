@@ -0,0 +1,118 @@
+import os
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+
+# Every index the app relies on, per collection. Keyset pagination sorts on
+# (sort_key, _id), so the list indexes carry _id as a tiebreaker suffix.
+INDEXES = {
+    "expenses": [
+        IndexModel([("token", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("token", ASCENDING), ("occurred_at", DESCENDING), ("_id", DESCENDING)]),
+        # /api/sync reads changes by sequence or recent updated_at
+        IndexModel([("token", ASCENDING), ("seq", ASCENDING)]),
+        IndexModel([("token", ASCENDING), ("updated_at", ASCENDING)]),
+        # /api/expenses/search; the token prefix keeps each search to one user's
+        # entries. Category matches count double so "transport" ranks Transport
+        # expenses first. Changing weights means dropping and recreating the index.
+        IndexModel(
+            [("token", ASCENDING), ("description", TEXT), ("category", TEXT)],
+            weights={"description": 1, "category": 2},
+            name="expenses_search",
+        ),
+    ],
+    "savings": [
+        IndexModel([("token", ASCENDING), ("occurred_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("token", ASCENDING), ("seq", ASCENDING)]),
+        IndexModel([("token", ASCENDING), ("updated_at", ASCENDING)]),
+    ],
+    "tombstones": [
+        IndexModel([("token", ASCENDING), ("seq", ASCENDING)]),
+        IndexModel([("token", ASCENDING), ("at", ASCENDING)]),
+        IndexModel([("at", ASCENDING)], expireAfterSeconds=int(os.getenv("SYNC_TOMBSTONE_TTL_DAYS", "30")) * 86400),
+    ],
+    "settings": [
+        IndexModel([("token", ASCENDING)], unique=True),
+    ],
+    "profiles": [
+        IndexModel([("token", ASCENDING)], unique=True),
+    ],
+    "daily_rollups": [
+        IndexModel([("token", ASCENDING), ("day", ASCENDING), ("category", ASCENDING)], unique=True),
+    ],
+    "savings_balances": [
+        IndexModel([("token", ASCENDING)], unique=True),
+    ],
+    "data_versions": [
+        IndexModel([("token", ASCENDING)], unique=True),
+    ],
+    "users": [
+        # Legacy /api/auth/google users have no google_id; only real ids must be unique
+        IndexModel(
+            [("google_id", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"google_id": {"$type": "string"}},
+        ),
+        IndexModel([("email", ASCENDING)]),
+        IndexModel([("access_token", ASCENDING)]),
+        IndexModel([("token", ASCENDING)]),
+    ],
+    "jobs": [
+        # Workers claim the oldest queued (or stale running) job
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)]),
+        IndexModel([("token", ASCENDING), ("created_at", DESCENDING)]),
+        # At most one queued or running job per user and kind (see submit_job)
+        IndexModel([("active_key", ASCENDING)], unique=True, sparse=True),
+        # Only finished jobs carry finished_at, so queued and running ones never expire
+        IndexModel([("finished_at", ASCENDING)], expireAfterSeconds=int(os.getenv("JOB_TTL_DAYS", "7")) * 86400),
+    ],
+    # Diagnostics only; expire old entries instead of growing forever
+    "slow_queries": [
+        IndexModel([("at", DESCENDING)], expireAfterSeconds=int(os.getenv("SLOW_QUERY_TTL_DAYS", "7")) * 86400),
+    ],
+}
+
+
+def _name(model: IndexModel) -> str:
+    return model.document["name"]
+
+
+def ensure_indexes(db):
+    """Create every index in the manifest. Returns a list of (collection, name, error).
+
+    Per-index failures (e.g. an existing index with conflicting options) are
+    collected; connection errors propagate so boot does not stall once per index.
+    """
+    failures = []
+    for coll, models in INDEXES.items():
+        for model in models:
+            try:
+                db[coll].create_indexes([model])
+            except OperationFailure as e:
+                failures.append((coll, _name(model), str(e)))
+    return failures
+
+
+def verify_indexes(db):
+    """Compare the manifest against the live database.
+
+    Returns a dict with ``missing`` (declared but absent) and ``unused``
+    (present but with zero recorded accesses since server start), each a
+    list of (collection, index_name).
+    """
+    report = {"missing": [], "unused": []}
+    for coll, models in INDEXES.items():
+        existing = db[coll].index_information()
+        for model in models:
+            if _name(model) not in existing:
+                report["missing"].append((coll, _name(model)))
+        try:
+            stats = db[coll].aggregate([{"$indexStats": {}}])
+            for s in stats:
+                if s["name"] != "_id_" and not s.get("accesses", {}).get("ops"):
+                    report["unused"].append((coll, s["name"]))
+        except OperationFailure:
+            # $indexStats is unavailable on some deployments; report what we can
+            pass
+    return report
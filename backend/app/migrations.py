@@ -0,0 +1,45 @@
+from pymongo import UpdateOne
+
+from app.utils.date_utils import to_utc_datetime
+
+
+LEDGER_COLLECTIONS = ("expenses", "savings")
+
+
+def backfill_occurred_at(db, collection: str, batch_size: int = 1000, log=print) -> dict:
+    """Populate ``occurred_at`` from ``date`` for documents written before it existed.
+
+    Walks the collection in ``_id`` order, one batch per bulk write, and records
+    the last processed ``_id`` in ``db.migrations`` so an interrupted run resumes
+    where it stopped. Documents whose ``date`` cannot be parsed are counted and
+    left untouched. Returns counters for the run.
+    """
+    state_id = f"occurred_at:{collection}"
+    state = db.migrations.find_one({"_id": state_id}) or {}
+    last_id = state.get("last_id")
+    stats = {"updated": 0, "skipped": 0}
+
+    while True:
+        q = {"occurred_at": {"$exists": False}}
+        if last_id is not None:
+            q["_id"] = {"$gt": last_id}
+        batch = list(db[collection].find(q, {"date": 1}).sort("_id", 1).limit(batch_size))
+        if not batch:
+            break
+
+        ops = []
+        for doc in batch:
+            occurred = to_utc_datetime(doc.get("date"))
+            if occurred is None:
+                stats["skipped"] += 1
+                continue
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"occurred_at": occurred}}))
+        if ops:
+            stats["updated"] += db[collection].bulk_write(ops, ordered=False).modified_count
+
+        last_id = batch[-1]["_id"]
+        db.migrations.update_one({"_id": state_id}, {"$set": {"last_id": last_id}}, upsert=True)
+        log(f"[{collection}] {stats['updated']} updated, {stats['skipped']} skipped")
+
+    db.migrations.update_one({"_id": state_id}, {"$set": {"done": True}}, upsert=True)
+    return stats
@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from app.utils.date_utils import to_utc_datetime
+
 
 def now_utc():
     return datetime.utcnow()
@@ -13,6 +15,7 @@ def new_expense_document(token: str, data: dict) -> dict:
         "amount": float(data.get("amount", 0)),
         "description": data.get("description", ""),
         "date": data.get("date"),  # ISO string expected
+        "occurred_at": to_utc_datetime(data.get("date")),  # canonical, indexed
         "recovered_from_savings": bool(data.get("recovered_from_savings", False)),
         "created_at": created,
         "updated_at": created,
@@ -31,6 +34,7 @@ def apply_expense_updates(doc: dict, updates: dict) -> dict:
 
     if "date" in updates:
         doc["date"] = updates["date"]
+        doc["occurred_at"] = to_utc_datetime(updates["date"])
     
     # If we decide later to modify recovery status
     if "recovered_from_savings" in updates:
@@ -0,0 +1,14 @@
+from datetime import datetime
+
+
+def new_savings_document(token: str, amount: float, kind: str, note: str = "") -> dict:
+    now = datetime.utcnow()
+    return {
+        "token": token,
+        "amount": amount,
+        "type": kind,  # "add" | "use"
+        "note": note,
+        "date": now,
+        "occurred_at": now,  # canonical, indexed
+        "updated_at": now,
+    }
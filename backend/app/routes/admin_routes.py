@@ -1,28 +1,27 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, jsonify, g, request
 
-from app.config import db
+from app.services.reset_service import RESET_JOB
+from app.utils.jobs import job_view, submit_job
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
 
 
 @admin_bp.route("/reset", methods=["POST"])
 def reset_user_data():
-    data = request.get_json(silent=True) or {}
-    token = data.get("token")
+    """Queue deletion of the user's expenses, savings and settings.
+
+    Body: include_profile (bool) also deletes the profile. Returns 202 with
+    the job; poll GET /api/jobs/<id> for progress and the deleted counts.
+    """
+    token = g.token
     if not token:
         return jsonify({"success": False, "message": "token is required"}), 400
 
-    # All collections now use 'token' to identify the user
-    exp_result = db.expenses.delete_many({"token": token})
-    sav_result = db.savings.delete_many({"token": token})
-    set_result = db.settings.delete_many({"token": token})
-
+    data = request.get_json(silent=True) or {}
+    job = submit_job(token, RESET_JOB, {"include_profile": bool(data.get("include_profile"))})
+    view = job_view(job)
     return jsonify({
         "success": True,
-        "message": "User data reset",
-        "data": {
-            "deleted_expenses": exp_result.deleted_count,
-            "deleted_savings": sav_result.deleted_count,
-            "deleted_settings": set_result.deleted_count,
-        },
-    }), 200
+        "message": "User data reset queued",
+        "data": view,
+    }), 202, {"Location": f"/api/jobs/{view['id']}"}
@@ -1,7 +1,6 @@
 from flask import Blueprint, request, jsonify
-from google.oauth2 import id_token
-from google.auth.transport import requests
 from app.config import db, GOOGLE_CLIENT_ID
+from app.auth.google_certs import verify_google_id_token
 import uuid
 from datetime import datetime
 
@@ -18,11 +17,7 @@ def google_auth():
         if not credential:
             return jsonify({'success': False, 'message': 'missing creds'}), 404
         
-        google_user = id_token.verify_oauth2_token(
-        credential,
-        requests.Request(),
-        GOOGLE_CLIENT_ID
-        )
+        google_user = verify_google_id_token(credential, GOOGLE_CLIENT_ID)
         email = google_user.get("email")
         name = google_user.get("name")
         avatar = google_user.get("picture")
@@ -74,12 +69,6 @@ def auth_login():
     if not google_id_val or not name or not email or not picture:
         return jsonify({'success': False, 'message': 'missing login details'}), 400
 
-    # Ensure unique index on google_id
-    try:
-        db.users.create_index('google_id', unique=True)
-    except Exception:
-        pass
-
     users = db.users
     existing = users.find_one({'google_id': google_id_val})
 
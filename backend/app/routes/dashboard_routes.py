@@ -0,0 +1,32 @@
+from flask import Blueprint, request, g
+
+from app.services.dashboard_service import load_dashboard
+from app.utils.pagination import parse_limit
+from app.utils.response import success, error
+from app.utils.versioning import conditional
+
+dashboard_bp = Blueprint("dashboard", __name__, url_prefix="/api")
+
+
+@dashboard_bp.route("/dashboard", methods=["GET"])
+@conditional
+def dashboard():
+    """Settings, first expense page, savings balance and period summary in one call.
+
+    Query params:
+    - token: user token (required)
+    - period: week|month|year for the summary and totals (default: month)
+    - limit: size of the expense page (default 50)
+    """
+    token = g.token
+    if not token:
+        return error("token is required", 400)
+    period = (request.args.get("period") or "month").lower()
+    limit, err = parse_limit(request.args.get("limit"))
+    if err:
+        return error(err, 400)
+
+    payload, err = load_dashboard(token, period, limit, request.args.get("after"))
+    if err:
+        return error(err, 400)
+    return success("Dashboard fetched", payload, 200)
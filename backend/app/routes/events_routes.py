@@ -0,0 +1,45 @@
+from flask import Blueprint, Response, g, stream_with_context
+
+from app.utils.events import (
+    EVENTS_HEARTBEAT_SECONDS,
+    HEARTBEAT,
+    RESYNC,
+    Subscription,
+    hub,
+    open_stream,
+)
+from app.utils.response import error
+
+events_bp = Blueprint("events", __name__, url_prefix="/api")
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # stop nginx from buffering the stream
+}
+
+
+@events_bp.route("/events", methods=["GET"])
+def events():
+    """Server-sent events for the caller's data changes (EventSource-friendly).
+
+    Under the sync server each open stream holds a worker thread; serve it
+    through the ASGI mode (asgi.py) to keep thousands of streams per node.
+    """
+    token = g.token
+    if not token:
+        return error("token is required", 400)
+    sub = open_stream(token, Subscription())
+
+    def stream():
+        try:
+            yield HEARTBEAT
+            while True:
+                message = sub.get(EVENTS_HEARTBEAT_SECONDS)
+                if sub.overflowed:
+                    yield RESYNC
+                    return
+                yield message or HEARTBEAT
+        finally:
+            hub.unsubscribe(token, sub)
+
+    return Response(stream_with_context(stream()), mimetype="text/event-stream", headers=SSE_HEADERS)
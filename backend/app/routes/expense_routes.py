@@ -1,14 +1,21 @@
-from flask import Blueprint, request
-from datetime import datetime, timedelta, timezone
+from flask import Blueprint, Response, request, g
 
 from app.utils.response import success, error
+from app.utils.pagination import parse_limit
+from app.utils.versioning import conditional
 from app.services.expense_service import (
     add_expense,
     get_expenses,
     update_expense,
     delete_expense,
+    summary_start_day,
+    build_summary,
 )
-from app.config import db
+from app.services.rollup_service import category_totals
+from app.services.import_service import import_expenses
+from app.services.export_service import MIMETYPES, build_export_query, iter_export
+from app.services.search_service import SEARCH_SORTS, build_search_query, search_expenses
+from app.services.settings_service import get_settings_record
 
 
 expense_routes = Blueprint("expense_routes", __name__, url_prefix="/api/expenses")
@@ -17,7 +24,7 @@ expense_routes = Blueprint("expense_routes", __name__, url_prefix="/api/expenses
 @expense_routes.route("/add", methods=["POST"])
 def add():
     data = request.get_json(silent=True) or {}
-    token = data.get("token")
+    token = g.token
     if not token:
         return error("token is required", 400)
     saved, err = add_expense(token, data)
@@ -27,18 +34,64 @@ def add():
 
 
 @expense_routes.route("/list", methods=["GET"])
+@conditional
 def list_expenses():
-    token = request.args.get("token")
+    token = g.token
     if not token:
         return error("token is required", 400)
-    items = get_expenses(token)
-    return success("Expenses fetched", items, 200)
+    limit, err = parse_limit(request.args.get("limit"))
+    if err:
+        return error(err, 400)
+    page, err = get_expenses(token, limit, request.args.get("after"))
+    if err:
+        return error(err, 400)
+    return success("Expenses fetched", page["items"], 200, next_cursor=page["next_cursor"])
+
+
+@expense_routes.route("/search", methods=["GET"])
+@conditional
+def search():
+    """Full-text search over description and category.
+
+    Query params:
+    - token: user token (required)
+    - q: search terms (required); words match stemmed, "quoted phrases" exactly, -word excludes
+    - from, to: optional ISO date bounds (from inclusive, to exclusive)
+    - category: optional exact category filter
+    - min_amount, max_amount: optional inclusive amount bounds
+    - sort: relevance|date (default: relevance)
+    - limit, after: page size and the next_cursor of the previous page
+    """
+    token = g.token
+    if not token:
+        return error("token is required", 400)
+    sort = (request.args.get("sort") or "relevance").lower()
+    if sort not in SEARCH_SORTS:
+        return error("sort must be one of: relevance, date", 400)
+    limit, err = parse_limit(request.args.get("limit"))
+    if err:
+        return error(err, 400)
+    query, err = build_search_query(
+        token,
+        request.args.get("q"),
+        request.args.get("from"),
+        request.args.get("to"),
+        request.args.get("category"),
+        request.args.get("min_amount"),
+        request.args.get("max_amount"),
+    )
+    if err:
+        return error(err, 400)
+    page, err = search_expenses(token, query, sort, limit, request.args.get("after"))
+    if err:
+        return error(err, 400)
+    return success("Search results fetched", page["items"], 200, next_cursor=page["next_cursor"])
 
 
 @expense_routes.route("/update/<expense_id>", methods=["PUT"])
 def update(expense_id):
     data = request.get_json(silent=True) or {}
-    token = data.get("token")
+    token = g.token
     if not token:
         return error("token is required", 400)
     saved, err = update_expense(token, expense_id, data)
@@ -50,7 +103,7 @@ def update(expense_id):
 
 @expense_routes.route("/delete/<expense_id>", methods=["DELETE"])
 def delete(expense_id):
-    token = request.args.get("token") or (request.get_json(silent=True) or {}).get("token")
+    token = g.token
     if not token:
         return error("token is required", 400)
     ok, err = delete_expense(token, expense_id)
@@ -60,7 +113,61 @@ def delete(expense_id):
     return success("Expense deleted", None, 200)
 
 
+@expense_routes.route("/import", methods=["POST"])
+def import_bulk():
+    """Bulk-import expenses from a streamed CSV or NDJSON request body.
+
+    Query params:
+    - token: user token (required)
+    - format: csv|ndjson (default: inferred from Content-Type, else csv)
+
+    CSV needs a header row using the same field names as /add.
+    """
+    token = g.token
+    if not token:
+        return error("token is required", 400)
+    fmt = (request.args.get("format") or "").lower()
+    if not fmt:
+        fmt = "ndjson" if "ndjson" in (request.mimetype or "") else "csv"
+    report, err = import_expenses(token, request.stream, fmt)
+    if err:
+        return error(err, 400, report)
+    return success("Import finished", report, 200)
+
+
+@expense_routes.route("/export", methods=["GET"])
+def export():
+    """Stream a user's expenses as CSV or NDJSON, oldest first.
+
+    Query params:
+    - token: user token (required)
+    - format: csv|ndjson (default: csv)
+    - from, to: optional ISO date bounds (from inclusive, to exclusive)
+    - category: optional exact category filter
+    """
+    token = g.token
+    if not token:
+        return error("token is required", 400)
+    fmt = (request.args.get("format") or "csv").lower()
+    if fmt not in MIMETYPES:
+        return error("format must be one of: csv, ndjson", 400)
+    q, err = build_export_query(
+        token,
+        request.args.get("from"),
+        request.args.get("to"),
+        request.args.get("category"),
+    )
+    if err:
+        return error(err, 400)
+    return Response(
+        iter_export("expenses", q, fmt),
+        mimetype=MIMETYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename=expenses.{fmt}"},
+    )
+
+
 @expense_routes.route("/summary", methods=["GET"])
+@conditional
 def summary():
     """Return per-category totals and percentage of budget for a user and period.
 
@@ -68,70 +175,15 @@ def summary():
     - token: user token (required)
     - period: week|month|year (default: week)
     """
-    token = request.args.get("token")
+    token = g.token
     period = (request.args.get("period") or "week").lower()
     if not token:
         return error("token is required", 400)
 
-    # Determine time window
-    now = datetime.now(timezone.utc)
-    if period == "year":
-        start = now - timedelta(days=365)
-    elif period == "month":
-        start = now - timedelta(days=30)
-    else:
-        start = now - timedelta(days=7)
-
     # Fetch user's budget from settings
-    settings = db.settings.find_one({"token": token}, {"_id": 0, "budget": 1}) or {}
-    budget = settings.get("budget") or 0
-    try:
-        budget = float(budget)
-    except Exception:
-        budget = 0.0
-
-    # Build query: by token, exclude recovered/paidFromSavings entries, and within period
-    q = {"token": token}
-    # Exclude paidFromSavings=true if present
-    q["$or"] = [{"paidFromSavings": {"$exists": False}}, {"paidFromSavings": False}]
-
-    # Date filtering: try created_at; fall back to string date field if available
-    q_time = {"created_at": {"$gte": start}}
-    # Some documents might store date as 'YYYY-MM-DD'
-    # We'll also allow those by OR-ing a string compare if present
-    date_str = start.date().isoformat()
-    q_date_str = {"date": {"$gte": date_str}}
-
-    # Combine: created_at OR date string greater than start
-    q["$and"] = [{"$or": [q_time, q_date_str]}]
-
-    cursor = db.expenses.find(q, {"_id": 0, "category": 1, "amount": 1})
-
-    totals = {}
-    for doc in cursor:
-        try:
-            amt = float(doc.get("amount") or 0)
-        except Exception:
-            amt = 0.0
-        if amt <= 0:
-            continue
-        cat = doc.get("category") or "Other"
-        totals[cat] = totals.get(cat, 0.0) + amt
-
-    items = []
-    for cat, total in totals.items():
-        pct = 0.0
-        if budget and budget > 0:
-            pct = min(100.0, (total / float(budget)) * 100.0)
-        items.append({
-            "category": cat,
-            "amount": round(float(total), 2),
-            "percent": round(pct, 2),
-        })
-
-    # Sort by percent desc
-    items.sort(key=lambda x: x["percent"], reverse=True)
-
-    payload = {"items": items, "totalBudget": round(float(budget), 2)}
-    return success("Summary fetched", payload, 200)
+    settings = get_settings_record(token) or {}
+
+    # Per-day, per-category rollups keep this to a bounded read per user
+    totals = category_totals(token, summary_start_day(period))
 
+    return success("Summary fetched", build_summary(totals, settings.get("budget")), 200)
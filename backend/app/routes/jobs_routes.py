@@ -0,0 +1,39 @@
+from flask import Blueprint, g
+
+from app.utils.jobs import cancel_job, get_job, job_view, list_jobs
+from app.utils.response import success, error
+
+jobs_bp = Blueprint("jobs", __name__, url_prefix="/api/jobs")
+
+
+@jobs_bp.route("", methods=["GET"])
+def jobs_list():
+    """The user's 20 most recent jobs, newest first."""
+    token = g.token
+    if not token:
+        return error("token is required", 400)
+    return success("Jobs fetched", [job_view(doc) for doc in list_jobs(token)], 200)
+
+
+@jobs_bp.route("/<job_id>", methods=["GET"])
+def job_status(job_id):
+    """Status, progress ({done, total, stage}) and, once finished, result or error."""
+    token = g.token
+    if not token:
+        return error("token is required", 400)
+    doc = get_job(token, job_id)
+    if doc is None:
+        return error("Job not found", 404)
+    return success("Job fetched", job_view(doc), 200)
+
+
+@jobs_bp.route("/<job_id>/cancel", methods=["POST"])
+def job_cancel(job_id):
+    """Cancel a queued job; a running one stops after its current chunk."""
+    token = g.token
+    if not token:
+        return error("token is required", 400)
+    doc = cancel_job(token, job_id)
+    if doc is None:
+        return error("Job not found", 404)
+    return success("Cancellation requested", job_view(doc), 200)
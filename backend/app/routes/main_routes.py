@@ -1,4 +1,10 @@
-from flask import Blueprint, jsonify
+import time
+
+from flask import Blueprint, Response, jsonify
+
+from app.config import db, pool_stats
+from app.utils.http_client import http_stats
+from app.utils.metrics import REGISTRY
 
 main_routes = Blueprint("main_routes", __name__)
 
@@ -8,3 +14,30 @@ def home():
         "status": "OK",
         "message": "Expense Tracker Backend is running successfully 🚀"
     }), 200
+
+
+@main_routes.route("/healthz", methods=["GET"])
+def healthz():
+    """Liveness: the process is serving. Does not touch the database."""
+    return jsonify({"status": "OK", "pool": pool_stats.snapshot(), "http": http_stats()}), 200
+
+
+@main_routes.route("/readyz", methods=["GET"])
+def readyz():
+    """Readiness: the database answers a ping within the configured timeouts."""
+    started = time.perf_counter()
+    try:
+        db.client.admin.command("ping")
+    except Exception as e:
+        return jsonify({"status": "UNAVAILABLE", "error": str(e), "pool": pool_stats.snapshot()}), 503
+    return jsonify({
+        "status": "OK",
+        "ping_ms": round((time.perf_counter() - started) * 1000, 3),
+        "pool": pool_stats.snapshot(),
+    }), 200
+
+
+@main_routes.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus scrape endpoint for this worker's request and Mongo metrics."""
+    return Response(REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
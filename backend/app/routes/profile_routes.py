@@ -1,4 +1,5 @@
-from flask import Blueprint, request
+from flask import Blueprint, request, g
+from pymongo import ReturnDocument
 
 from app.utils.response import success, error
 from app.config import db
@@ -9,7 +10,7 @@ profile_bp = Blueprint("profile_bp", __name__, url_prefix="/api/profile")
 @profile_bp.route("/update", methods=["POST"])
 def update_profile():
     data = request.get_json(silent=True) or {}
-    token = data.get("token")
+    token = g.token
     name = data.get("name")
     avatar = data.get("avatar")
     if not token:
@@ -28,6 +29,15 @@ def update_profile():
     if email is not None:
         update["email"] = email
 
-    db.profiles.update_one({"token": token}, {"$set": update, "$setOnInsert": {"token": token}}, upsert=True)
-    saved = db.profiles.find_one({"token": token}, {"_id": 0}) or {"token": token, **update}
+    # A new profile starts from the signed-in user's name and email
+    user = g.user or {}
+    defaults = {k: user[k] for k in ("name", "email") if user.get(k) and k not in update}
+
+    saved = db.profiles.find_one_and_update(
+        {"token": token},
+        {"$set": update, "$setOnInsert": {"token": token, **defaults}},
+        projection={"_id": 0},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    ) or {"token": token, **update}
     return success("Profile updated", saved, 200)
@@ -1,32 +1,24 @@
-from datetime import datetime
-
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, g
 
 from app.config import db
+from app.models.expense_model import new_expense_document
+from app.models.savings_model import new_savings_document
+from app.utils.serializers import SAVINGS_PROJECTION, serialize_document, serialize_documents
+from app.utils.pagination import parse_limit, paginate
+from app.utils.events import publish_event
+from app.utils.versioning import begin_change, conditional
+from app.services.rollup_service import record_savings
+from app.services.savings_service import get_balance, record_balance
+from app.services.export_service import MIMETYPES, build_export_query, iter_export
 
 
 savings_routes = Blueprint("savings_routes", __name__, url_prefix="/api")
 
 
-def _iso(dt):
-    if isinstance(dt, datetime):
-        return dt.isoformat()
-    return dt
-
-
-def _doc_to_dict(doc):
-    out = dict(doc)
-    if out.get("_id"):
-        out["id"] = str(out.pop("_id"))
-    if out.get("date"):
-        out["date"] = _iso(out["date"])
-    return out
-
-
 @savings_routes.route("/savings/add", methods=["POST"])
 def savings_add():
     data = request.get_json(silent=True) or {}
-    token = data.get("token")
+    token = g.token
     amount = data.get("amount")
     note = data.get("note", "")
 
@@ -37,22 +29,20 @@ def savings_add():
     except (TypeError, ValueError):
         return jsonify({"success": False, "message": "amount must be a number"}), 400
 
-    doc = {
-        "token": token,
-        "amount": amount_val,
-        "type": "add",
-        "note": note,
-        "date": datetime.utcnow(),
-    }
-    res = db.savings.insert_one(doc)
-    saved = db.savings.find_one({"_id": res.inserted_id})
-    return jsonify({"success": True, "message": "Saving added", "data": _doc_to_dict(saved)}), 201
+    doc = new_savings_document(token, amount_val, "add", note)
+    doc["seq"], _ = begin_change(token)
+    db.savings.insert_one(doc)  # sets doc["_id"]
+    record_savings(token, doc)
+    record_balance(token, doc)
+    serialized = serialize_document(doc)
+    publish_event(token, "savings.added", serialized, doc["seq"])
+    return jsonify({"success": True, "message": "Saving added", "data": serialized}), 201
 
 
 @savings_routes.route("/savings/use", methods=["POST"])
 def savings_use():
     data = request.get_json(silent=True) or {}
-    token = data.get("token")
+    token = g.token
     amount = data.get("amount")
     note = data.get("note", "")
     category = data.get("category", "Misc")
@@ -66,63 +56,82 @@ def savings_use():
         return jsonify({"success": False, "message": "amount must be a number"}), 400
 
     # Add record to savings ledger
-    saving_doc = {
-        "token": token,
-        "amount": amount_val,
-        "type": "use",
-        "note": note,
-        "date": datetime.utcnow(),
-    }
-    res = db.savings.insert_one(saving_doc)
+    saving_doc = new_savings_document(token, amount_val, "use", note)
+    seq, _ = begin_change(token)
+    saving_doc["seq"] = seq
+    db.savings.insert_one(saving_doc)
+    record_balance(token, saving_doc)
 
     # Add record into expenses with recovered flag
-    expense_doc = {
-        "token": token,
+    expense_doc = new_expense_document(token, {
         "amount": amount_val,
         "category": category,
         "description": description,
         "recovered_from_savings": True,
-        "date": datetime.utcnow(),
-    }
+        "date": saving_doc["date"].isoformat(),
+    })
+    expense_doc["seq"] = seq
     db.expenses.insert_one(expense_doc)
+    record_savings(token, saving_doc, expense_doc)
 
-    saved = db.savings.find_one({"_id": res.inserted_id})
-    return jsonify({"success": True, "message": "Saving used and expense recorded", "data": _doc_to_dict(saved)}), 201
+    serialized = serialize_document(saving_doc)
+    publish_event(token, "savings.used", {"saving": serialized, "expense": serialize_document(expense_doc)}, seq)
+    return jsonify({"success": True, "message": "Saving used and expense recorded", "data": serialized}), 201
 
 
 
 @savings_routes.route("/savings/get", methods=["GET"])
+@conditional
 def savings_get():
-    token = request.args.get("token")
+    token = g.token
+    if not token:
+        return jsonify({"success": False, "message": "token is required"}), 400
+    limit, err = parse_limit(request.args.get("limit"))
+    if err:
+        return jsonify({"success": False, "message": err}), 400
+    try:
+        docs, next_cursor = paginate(
+            db.savings, {"token": token}, "occurred_at", limit, request.args.get("after"),
+            projection=SAVINGS_PROJECTION,
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    items = serialize_documents(docs)
+    return jsonify({
+        "success": True,
+        "message": "Savings fetched",
+        "data": items,
+        "next_cursor": next_cursor,
+    }), 200
+
+
+@savings_routes.route("/savings/export", methods=["GET"])
+def savings_export():
+    token = g.token
     if not token:
         return jsonify({"success": False, "message": "token is required"}), 400
-    cursor = db.savings.find({"token": token}).sort("date", -1)
-    items = [_doc_to_dict(d) for d in cursor]
-    return jsonify({"success": True, "message": "Savings fetched", "data": items}), 200
+    fmt = (request.args.get("format") or "csv").lower()
+    if fmt not in MIMETYPES:
+        return jsonify({"success": False, "message": "format must be one of: csv, ndjson"}), 400
+    q, err = build_export_query(token, request.args.get("from"), request.args.get("to"))
+    if err:
+        return jsonify({"success": False, "message": err}), 400
+    return Response(
+        iter_export("savings", q, fmt),
+        mimetype=MIMETYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename=savings.{fmt}"},
+    )
 
 
 @savings_routes.route("/savings/summary", methods=["GET"])
+@conditional
 def savings_summary():
-    token = request.args.get("token")
+    token = g.token
     if not token:
         return jsonify({"success": False, "message": "token is required"}), 400
-    cursor = db.savings.find({"token": token})
-    total_added = 0.0
-    total_used = 0.0
-    for d in cursor:
-        amt = float(d.get("amount") or 0)
-        if d.get("type") == "add":
-            total_added += amt
-        elif d.get("type") == "use":
-            total_used += amt
-    current = total_added - total_used
     return jsonify({
         "success": True,
         "message": "Summary fetched",
-        "data": {
-            "total_added": total_added,
-            "total_used": total_used,
-            "current_savings": current,
-        },
+        "data": get_balance(token),
     }), 200
 
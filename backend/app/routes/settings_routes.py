@@ -1,7 +1,8 @@
-from flask import Blueprint, request, jsonify
-from datetime import datetime
+from flask import Blueprint, request, jsonify, g
 
-from app.config import db
+from app.services.settings_service import get_settings_record, save_settings_record, settings_view
+from app.utils.events import publish_event
+from app.utils.versioning import begin_change, conditional
 
 
 settings_bp = Blueprint("settings", __name__, url_prefix="/api")
@@ -11,7 +12,7 @@ settings_bp = Blueprint("settings", __name__, url_prefix="/api")
 def save_settings():
     try:
         data = request.get_json(silent=True) or {}
-        token = data.get("token")
+        token = g.token
         income = data.get("income")
         budget = data.get("budget")
         notifications = data.get("notifications")
@@ -20,21 +21,15 @@ def save_settings():
         if not token:
             return jsonify({"success": False, "message": "token is required"}), 400
 
-        settings_collection = db.settings
-
-        settings_collection.update_one(
-            {"token": token},
-            {
-                "$set": {
-                    "income": income,
-                    "budget": budget,
-                    "notifications": notifications,
-                    "currency": currency,
-                    "updated_at": datetime.utcnow(),
-                }
-            },
-            upsert=True,
-        )
+        seq, version = begin_change(token)
+        record = save_settings_record(token, {
+            "income": income,
+            "budget": budget,
+            "notifications": notifications,
+            "currency": currency,
+            "seq": seq,
+        }, version)
+        publish_event(token, "settings.saved", settings_view(dict(record)), seq)
 
         return jsonify({"success": True, "message": "Settings updated successfully"}), 200
     except Exception as e:
@@ -42,29 +37,14 @@ def save_settings():
 
 
 @settings_bp.route("/settings/get", methods=["GET"])
+@conditional
 def get_settings():
     try:
-        token = request.args.get("token")
+        token = g.token
         if not token:
             return jsonify({"success": False, "message": "token is required"}), 400
 
-        settings_collection = db.settings
-        record = settings_collection.find_one({"token": token}, {"_id": 0})
-
-        if not record:
-            return jsonify({
-                "success": True,
-                "data": {
-                    "income": None,
-                    "budget": None,
-                    "notifications": {"budgetAlert": False, "largeExpense": False, "monthlyEmail": False},
-                    "currency": "$",
-                },
-            }), 200
-
-        # Ensure currency default when missing in older records
-        if not record.get("currency"):
-            record["currency"] = "$"
+        record = settings_view(get_settings_record(token))
 
         return jsonify({"success": True, "data": record}), 200
     except Exception as e:
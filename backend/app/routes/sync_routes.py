@@ -0,0 +1,29 @@
+from flask import Blueprint, request, g
+
+from app.services.sync_service import sync_changes
+from app.utils.response import success, error
+from app.utils.versioning import conditional
+
+sync_bp = Blueprint("sync", __name__, url_prefix="/api")
+
+
+@sync_bp.route("/sync", methods=["GET"])
+@conditional
+def sync():
+    """Expenses, savings and settings changed since a cursor, plus deletions.
+
+    Query params:
+    - token: user token (required)
+    - since: cursor from a previous call; omit to get a starting cursor
+
+    Clients apply ``reset`` (drop everything) first, then ``deleted``, then
+    upsert the returned documents by id, and keep ``cursor`` for the next call.
+    On ``full_resync`` they reload through the regular endpoints instead.
+    """
+    token = g.token
+    if not token:
+        return error("token is required", 400)
+    payload, cursor, err = sync_changes(token, request.args.get("since"))
+    if err:
+        return error(err, 400)
+    return success("Changes fetched", payload, 200, cursor=cursor)
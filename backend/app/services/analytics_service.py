@@ -0,0 +1,133 @@
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from app.config import db
+from app.services.rollup_service import SAVINGS_CATEGORY
+from app.services.savings_service import get_balance
+
+
+# Shared by all requests; each analytics call runs its reads side by side
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="analytics")
+
+
+def get_period_bounds(period):
+    now = datetime.utcnow()
+    
+    if period == 'week':
+        start = now - timedelta(days=7)
+
+    elif period == 'month':
+        start = now - timedelta(days=30)
+
+    elif period == "year":
+        year = now.year
+        if (year % 400 == 0) or (year % 4 == 0 and year % 100 != 0):
+            start = now - timedelta(days=366)
+        else:
+            start = now - timedelta(days=365)
+
+    else:
+        start = now - timedelta(days=30)
+
+    return start
+
+
+def expense_pipeline(token: str, start_day: str) -> list:
+    return [
+        {"$match": {"token": token, "day": {"$gte": start_day}, "category": {"$ne": SAVINGS_CATEGORY}}},
+        {"$facet": {
+            "total": [{"$group": {"_id": None, "spent": {"$sum": "$spent"}}}],
+            "by_day": [{"$group": {"_id": "$day", "spent": {"$sum": "$spent"}}}],
+            "by_category": [
+                {"$group": {"_id": "$category", "amount": {"$sum": "$spent"}}},
+                {"$match": {"amount": {"$gt": 0}}},
+            ],
+        }},
+    ]
+
+
+def savings_pipeline(token: str, start_day: str) -> list:
+    return [
+        {"$match": {"token": token, "day": {"$gte": start_day}, "category": SAVINGS_CATEGORY}},
+        {"$group": {"_id": "$day", "saved": {"$sum": "$saved"}}},
+    ]
+
+
+def _run(pipeline: list) -> list:
+    return list(db.daily_rollups.aggregate(pipeline))
+
+
+def period_analytics(token: str, start_day: str) -> dict:
+    """Totals, per-day spent/saved series and per-category sums since start_day.
+
+    The expense and savings pipelines run concurrently against daily_rollups,
+    alongside the O(1) savings balance read.
+    """
+    # Each task runs in a copy of the request context so command listeners
+    # (slow-query capture) can still attribute its queries to the route
+    expenses_f = _executor.submit(copy_context().run, _run, expense_pipeline(token, start_day))
+    savings_f = _executor.submit(copy_context().run, _run, savings_pipeline(token, start_day))
+    balance_f = _executor.submit(copy_context().run, get_balance, token)
+    return assemble_analytics(expenses_f.result(), savings_f.result(), balance_f.result())
+
+
+def assemble_analytics(expense_rows: list, savings_by_day: list, balance: dict) -> dict:
+    """Merge raw pipeline output and the balance into the shape views render."""
+    facets = (expense_rows or [{}])[0]
+    total = facets.get("total") or [{}]
+    trend = {}
+    for row in facets.get("by_day", []):
+        trend.setdefault(row["_id"], {"spent": 0, "saved": 0})["spent"] = row["spent"]
+    for row in savings_by_day:
+        trend.setdefault(row["_id"], {"spent": 0, "saved": 0})["saved"] = row["saved"]
+
+    return {
+        "spent": total[0].get("spent", 0),
+        "balance": balance["current_savings"],
+        "trend": [{"date": k, "spent": v["spent"], "saved": v["saved"]} for k, v in sorted(trend.items())],
+        "categories": [{"category": row["_id"], "amount": row["amount"]} for row in facets.get("by_category", [])],
+    }
+
+
+def analytics_payload(chart_type: str, settings, result: dict) -> dict:
+    """The /api/analytics response body for a 'line' or 'pie' chart."""
+    income = settings.get('income', 0) if settings else 0
+    budget = settings.get('budget', 0) if settings else 0
+
+    # ---------- CALCULATE TOTALS ----------
+    total_spent = result["spent"]
+    current_savings = result["balance"]
+    remaining_budget = budget - total_spent
+
+    # ---------- PIE CHART ----------
+    if chart_type == "pie":
+        return {
+            "success": True,
+            "mode": "pie",
+            "data": result["categories"]
+        }
+
+    # ---------- LINE CHART ----------
+    # ---------------- THRESHOLD COLOR ----------------
+    spent_percent = (total_spent / budget * 100) if budget else 0
+    if spent_percent < 50:
+        status_color = "green"
+    elif spent_percent < 75:
+        status_color = "yellow"
+    else:
+        status_color = "red"
+
+    return {
+        "success": True,
+        "mode": "line",
+        "totals": {
+            "income": income,
+            "budget": budget,
+            "spent": total_spent,
+            "remaining": remaining_budget,
+            "savings": current_savings,
+            "status_color": status_color,
+        },
+        "trend": result["trend"]
+    }
@@ -0,0 +1,81 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from app.services.expense_service import build_summary, get_expenses, summary_start_day
+from app.services.rollup_service import category_totals
+from app.services.savings_service import get_balance
+from app.services.settings_service import get_settings_record, settings_view
+
+
+# Bounded so a burst of dashboard loads queues here instead of opening more
+# Mongo connections than the pool allows; each load uses up to four workers.
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("DASHBOARD_WORKERS", "16")),
+    thread_name_prefix="dashboard",
+)
+
+
+def _submit(fn, *args):
+    return _executor.submit(copy_context().run, fn, *args)
+
+
+def _as_float(value) -> float:
+    # /settings/save stores whatever it is sent; treat junk as 0 like build_summary
+    try:
+        return float(value or 0)
+    except Exception:
+        return 0.0
+
+
+def dashboard_totals(settings: dict, spent: float, balance: dict) -> dict:
+    """Headline numbers for the dashboard period.
+
+    ``budget_left`` is budget minus the period's spending (negative once over
+    budget), the same figure /api/analytics reports as ``remaining``. It is not
+    FinanceContext.remainingBudget, which also deducts savings deposits, skips
+    expenses paid from savings, and floors at 0. ``remaining_money`` matches
+    FinanceContext.remainingMoney.
+    """
+    income = _as_float(settings.get("income"))
+    budget = _as_float(settings.get("budget"))
+    savings = balance["current_savings"]
+    return {
+        "income": income,
+        "budget": budget,
+        "spent": round(float(spent), 2),
+        "budget_left": round(budget - spent, 2),
+        "savings": round(savings, 2),
+        # Income left once the planned budget and the savings balance are set aside
+        "remaining_money": round(income - budget - savings, 2),
+    }
+
+
+def load_dashboard(token: str, period: str, limit: int, after: str = None):
+    """Everything the dashboard renders on load, fetched concurrently.
+
+    Returns (payload, error); error is set for an invalid ``after`` cursor.
+    """
+    settings_f = _submit(get_settings_record, token)
+    expenses_f = _submit(get_expenses, token, limit, after)
+    balance_f = _submit(get_balance, token)
+    totals_f = _submit(category_totals, token, summary_start_day(period))
+
+    page, err = expenses_f.result()
+    settings = settings_f.result()
+    balance = balance_f.result()
+    category = totals_f.result()
+    if err:
+        return None, err
+
+    budget = (settings or {}).get("budget")
+    settings = settings_view(settings)
+    return {
+        "settings": settings,
+        "expenses": page["items"],
+        "next_cursor": page["next_cursor"],
+        "savings": balance,
+        "summary": build_summary(category, budget),
+        "totals": dashboard_totals(settings, sum(category.values()), balance),
+        "period": period,
+    }, None
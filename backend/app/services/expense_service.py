@@ -1,23 +1,17 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 from app.config import db  # provided by project config
-from app.utils.validators import validate_expense_data
+from app.utils.validators import validate_expense_data, validate_expense_updates
 from app.models.expense_model import new_expense_document, apply_expense_updates
-
-def _serialize(exp):
-    if not exp:
-        return None
-    out = dict(exp)
-    # Convert Mongo fields
-    if out.get("_id"):
-        out["id"] = str(out.pop("_id"))
-    # Convert datetimes
-    for k in ("created_at", "updated_at"):
-        if isinstance(out.get(k), datetime):
-            out[k] = out[k].isoformat()
-    return out
-
+from app.utils.serializers import EXPENSE_PROJECTION, serialize_document, serialize_documents
+from app.utils.pagination import DEFAULT_PAGE_SIZE, paginate
+from app.services.rollup_service import record_expense, move_expense
+from app.services.sync_service import record_tombstones
+from app.utils.events import publish_event
+from app.utils.versioning import begin_change
 
 def add_expense(token: str, data: dict):
     ok, err = validate_expense_data(data)
@@ -25,57 +19,111 @@ def add_expense(token: str, data: dict):
         return None, err
 
     doc = new_expense_document(token, data)
-    inserted = db.expenses.insert_one(doc)
-    saved = db.expenses.find_one({"_id": inserted.inserted_id})
-    return _serialize(saved), None
+    doc["seq"], _ = begin_change(token)
+    db.expenses.insert_one(doc)  # sets doc["_id"]
+    record_expense(token, doc)
+    serialized = serialize_document(doc)
+    publish_event(token, "expense.added", serialized, doc["seq"])
+    return serialized, None
 
 
-def get_expenses(token: str):
-    cursor = db.expenses.find({"token": token}).sort("created_at", -1)
-    return [_serialize(e) for e in cursor]
+def get_expenses(token: str, limit: int = DEFAULT_PAGE_SIZE, after: str = None):
+    """Return one page of a user's expenses, newest first.
+
+    The page is a dict with ``items`` and ``next_cursor`` (None on the last page).
+    """
+    try:
+        docs, next_cursor = paginate(
+            db.expenses, {"token": token}, "created_at", limit, after, projection=EXPENSE_PROJECTION
+        )
+    except ValueError as e:
+        return None, str(e)
+    return {"items": serialize_documents(docs), "next_cursor": next_cursor}, None
 
 
 def update_expense(token: str, expense_id: str, data: dict):
-    # Validate fields if provided
-    # We perform a partial validation: only validate fields present
+    # Only fields present in the payload are validated and written
     partial = {}
     for key in ("category", "amount", "description", "date"):
         if key in data:
             partial[key] = data[key]
-    if partial:
-        # Build a temp dict merging existing doc for validation completeness
-        # Fetch existing
-        try:
-            existing = db.expenses.find_one({"_id": ObjectId(expense_id), "token": token})
-        except Exception:
-            existing = None
-        if not existing:
-            return None, "Expense not found"
-        temp = {**existing, **partial}
-        # Convert amount to provided type if needed for validation
-        ok, err = validate_expense_data({
-            "category": temp.get("category"),
-            "amount": temp.get("amount"),
-            "description": temp.get("description", ""),
-            "date": temp.get("date"),
-        })
-        if not ok:
-            return None, err
-
-        # Apply updates and persist
-        updated_doc = apply_expense_updates(existing, partial)
-        db.expenses.update_one({"_id": existing["_id"]}, {"$set": updated_doc})
-        saved = db.expenses.find_one({"_id": existing["_id"]})
-        return _serialize(saved), None
-    else:
+    if not partial:
         return None, "No valid fields to update"
 
+    ok, err = validate_expense_updates(partial)
+    if not ok:
+        return None, err
+
+    changes = apply_expense_updates({}, partial)
+    try:
+        expense_oid = ObjectId(expense_id)
+    except Exception:
+        return None, "Expense not found"
+    changes["seq"], _ = begin_change(token)
+    previous = db.expenses.find_one_and_update(
+        {"_id": expense_oid, "token": token},
+        {"$set": changes},
+        return_document=ReturnDocument.BEFORE,
+    )
+    if not previous:
+        return None, "Expense not found"
+
+    # The pre-image plus our $set is the stored document; no re-read needed
+    saved = {**previous, **changes}
+    move_expense(token, previous, saved)
+    serialized = serialize_document(saved)
+    publish_event(token, "expense.updated", serialized, changes["seq"])
+    return serialized, None
+
 
 def delete_expense(token: str, expense_id: str):
     try:
-        res = db.expenses.delete_one({"_id": ObjectId(expense_id), "token": token})
+        removed = db.expenses.find_one_and_delete({"_id": ObjectId(expense_id), "token": token})
     except Exception:
         return False, "Invalid expense id"
-    if res.deleted_count == 0:
+    if not removed:
         return False, "Expense not found"
+    record_expense(token, removed, sign=-1)
+    # After the delete is enough here; the sync overlap covers the tombstone
+    seq, _ = begin_change(token)
+    record_tombstones(token, "expenses", [removed["_id"]], seq)
+    publish_event(token, "expense.deleted", {"id": expense_id}, seq)
     return True, None
+
+
+def summary_start_day(period: str) -> str:
+    """First 'YYYY-MM-DD' day of a week|month|year summary window (default week)."""
+    now = datetime.now(timezone.utc)
+    if period == "year":
+        start = now - timedelta(days=365)
+    elif period == "month":
+        start = now - timedelta(days=30)
+    else:
+        start = now - timedelta(days=7)
+    return start.date().isoformat()
+
+
+def build_summary(totals: dict, budget) -> dict:
+    """Per-category amounts and percentage of budget, highest share first."""
+    try:
+        budget = float(budget or 0)
+    except Exception:
+        budget = 0.0
+
+    items = []
+    for cat, total in totals.items():
+        if total <= 0:
+            continue
+        pct = 0.0
+        if budget and budget > 0:
+            pct = min(100.0, (total / float(budget)) * 100.0)
+        items.append({
+            "category": cat,
+            "amount": round(float(total), 2),
+            "percent": round(pct, 2),
+        })
+
+    # Sort by percent desc
+    items.sort(key=lambda x: x["percent"], reverse=True)
+
+    return {"items": items, "totalBudget": round(float(budget), 2)}
@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from app.config import db
+from app.utils.date_utils import occurred_range, to_utc_datetime
+
+
+CURSOR_BATCH_SIZE = 500
+ROWS_PER_CHUNK = 200
+
+EXPORT_FIELDS = {
+    "expenses": ["id", "date", "category", "amount", "description", "recovered_from_savings", "created_at"],
+    "savings": ["id", "date", "type", "amount", "note"],
+}
+MIMETYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _row(doc: dict, fields: list) -> dict:
+    out = {}
+    for f in fields:
+        val = str(doc["_id"]) if f == "id" else doc.get(f)
+        out[f] = val.isoformat() if isinstance(val, datetime) else val
+    return out
+
+
+def build_export_query(token: str, start=None, end=None, category=None):
+    """Build the export filter from raw query params. Returns (query, error)."""
+    bounds = {}
+    for name, raw in (("from", start), ("to", end)):
+        if raw:
+            parsed = to_utc_datetime(raw)
+            if parsed is None:
+                return None, f"'{name}' must be an ISO format string"
+            bounds[name] = parsed
+    q = {"token": token, **occurred_range(bounds.get("from"), bounds.get("to"))}
+    if category:
+        q["category"] = category
+    return q, None
+
+
+def iter_export(collection: str, query: dict, fmt: str):
+    """Yield the matching documents as CSV or NDJSON text chunks, oldest first.
+
+    Rows come straight off the cursor, so memory stays flat regardless of
+    history size and the first bytes go out after the first batch.
+    """
+    fields = EXPORT_FIELDS[collection]
+    projection = {f: 1 for f in fields if f != "id"}
+    cursor = (
+        db[collection].find(query, projection)
+        .sort([("occurred_at", 1), ("_id", 1)])
+        .batch_size(CURSOR_BATCH_SIZE)
+    )
+
+    buf = io.StringIO()
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(buf, fieldnames=fields)
+        writer.writeheader()
+
+    pending = 0
+    for doc in cursor:
+        row = _row(doc, fields)
+        if writer:
+            writer.writerow(row)
+        else:
+            buf.write(json.dumps(row) + "\n")
+        pending += 1
+        if pending >= ROWS_PER_CHUNK:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+            pending = 0
+    if buf.tell():
+        yield buf.getvalue()
@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+
+from pymongo.errors import BulkWriteError
+
+from app.config import db
+from app.utils.validators import validate_expense_data
+from app.models.expense_model import new_expense_document
+from app.services.rollup_service import record_expenses
+from app.utils.events import publish_event
+from app.utils.versioning import begin_change
+
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+_TRUE_STRINGS = {"1", "true", "yes", "y"}
+
+
+def _iter_csv(stream):
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    for line_no, row in enumerate(csv.DictReader(text), start=1):
+        flag = row.get("recovered_from_savings")
+        if isinstance(flag, str):
+            row["recovered_from_savings"] = flag.strip().lower() in _TRUE_STRINGS
+        yield line_no, row, None
+
+
+def _iter_ndjson(stream):
+    for line_no, raw in enumerate(stream, start=1):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            yield line_no, json.loads(raw), None
+        except ValueError:
+            yield line_no, None, "invalid JSON"
+
+
+PARSERS = {"csv": _iter_csv, "ndjson": _iter_ndjson}
+
+
+def import_expenses(token: str, stream, fmt: str):
+    """Stream-parse, validate and insert expenses in bounded batches.
+
+    Only one batch of documents is held in memory at a time. Returns (report,
+    error): the report has inserted/failed counts and up to MAX_REPORTED_ERRORS
+    per-row errors. A body that cannot be decoded or parsed stops the import
+    with an error; the report then covers the rows before that point.
+    """
+    parser = PARSERS.get(fmt)
+    if parser is None:
+        return None, "format must be one of: csv, ndjson"
+
+    report = {"inserted": 0, "failed": 0, "errors": []}
+
+    def fail(row, message):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": row, "error": message})
+
+    def flush(batch):
+        if not batch:
+            return
+        rows = [row for row, _ in batch]
+        docs = [doc for _, doc in batch]
+        seq, _ = begin_change(token)  # one change per batch
+        for doc in docs:
+            doc["seq"] = seq
+        failed = set()
+        try:
+            db.expenses.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for we in e.details.get("writeErrors", []):
+                failed.add(we["index"])
+                fail(rows[we["index"]], we.get("errmsg", "write failed"))
+        written = [doc for i, doc in enumerate(docs) if i not in failed]
+        report["inserted"] += len(written)
+        record_expenses(token, written)
+
+    batch = []
+    row = 0
+    abort = None
+    try:
+        for row, data, parse_err in parser(stream):
+            if parse_err:
+                fail(row, parse_err)
+                continue
+            ok, err = validate_expense_data(data)
+            if not ok:
+                fail(row, err)
+                continue
+            batch.append((row, new_expense_document(token, data)))
+            if len(batch) >= BATCH_SIZE:
+                flush(batch)
+                batch = []
+    except UnicodeDecodeError:
+        abort = f"body is not valid UTF-8 after row {row}"
+    except csv.Error as e:
+        abort = f"malformed CSV after row {row} ({e})"
+    flush(batch)
+    if report["inserted"]:
+        # Too many rows to push individually; listeners pull them via /api/sync
+        publish_event(token, "expenses.imported", {"inserted": report["inserted"]})
+    return report, abort
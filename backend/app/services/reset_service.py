@@ -0,0 +1,58 @@
+from app.config import db
+from app.services.rollup_service import rebuild_rollups
+from app.services.savings_service import reconcile_balances
+from app.services.settings_service import invalidate_settings
+from app.services.sync_service import record_reset
+from app.utils.events import publish_event
+from app.utils.jobs import delete_in_chunks, register_job
+from app.utils.versioning import begin_change
+
+
+# What a reset deletes, with the field telling when each document was written;
+# ``users`` stays because it holds the login the token belongs to. Derived
+# data (rollups, balances) is rebuilt from what is left.
+RESET_COLLECTIONS = {"expenses": "created_at", "savings": "occurred_at", "settings": "updated_at"}
+RESET_JOB = "reset"
+
+
+# Given up after a worker died mid-delete: still settle what was deleted
+@register_job(RESET_JOB, on_abandon=lambda job: finish_reset(job.token))
+def reset_user_data(job):
+    """Delete a user's data in chunks; params: include_profile (bool)."""
+    token = job.token
+    queries = {name: written_before(token, field, job.created_at) for name, field in RESET_COLLECTIONS.items()}
+    if job.params.get("include_profile"):
+        queries["profiles"] = {"token": token}
+    total = sum(db[name].count_documents(query) for name, query in queries.items())
+    job.progress(0, total, "deleting")
+
+    deleted = {}
+    try:
+        for name, query in queries.items():
+            deleted[name] = delete_in_chunks(job, db[name], query)
+    finally:
+        # Also after a cancel or failure: whatever was deleted must reach
+        # caches, derived data and syncing clients
+        finish_reset(token)
+
+    return {
+        "deleted_expenses": deleted["expenses"],
+        "deleted_savings": deleted["savings"],
+        "deleted_settings": deleted["settings"],
+        "deleted_profile": deleted.get("profiles", 0),
+    }
+
+
+def written_before(token: str, field: str, cutoff) -> dict:
+    """The user's documents as of the reset request; later writes survive it."""
+    return {"token": token, "$or": [{field: {"$lte": cutoff}}, {field: {"$exists": False}}]}
+
+
+def finish_reset(token: str):
+    invalidate_settings(token)
+    rebuild_rollups(token)
+    reconcile_balances(token, fix=True)
+    # Tells syncing clients to drop everything they hold for this user
+    seq, _ = begin_change(token)
+    record_reset(token, seq)
+    publish_event(token, "data.reset", None, seq)
@@ -0,0 +1,145 @@
+from pymongo import UpdateOne
+
+from app.config import db
+from app.utils.date_utils import day_key, to_utc_datetime
+from app.utils.versioning import bump_version
+
+
+# Rollup rows are keyed by (token, day, category). Expense rows carry the
+# expense category and accumulate ``spent``; savings movements share one row
+# per day with category None and accumulate net ``saved`` (add minus use).
+SAVINGS_CATEGORY = None
+
+
+def _day(doc: dict):
+    # The UTC day of occurred_at, which list, search and export filter on, so an
+    # offset timestamp near midnight lands on the same day everywhere
+    occurred = doc.get("occurred_at") or to_utc_datetime(doc.get("date"))
+    return day_key(occurred or doc.get("date"))
+
+
+def _expense_key(doc: dict):
+    return _day(doc), doc.get("category") or "Other"
+
+
+def _inc(token: str, day: str, category, field: str, delta: float):
+    return UpdateOne(
+        {"token": token, "day": day, "category": category},
+        {"$inc": {field: delta}},
+        upsert=True,
+    )
+
+
+def _expense_ops(token: str, doc: dict, sign: int):
+    day, category = _expense_key(doc)
+    amount = float(doc.get("amount") or 0)
+    if not day or not amount:
+        return []
+    return [_inc(token, day, category, "spent", sign * amount)]
+
+
+def record_expense(token: str, doc: dict, sign: int = 1):
+    """Add (sign=1) or remove (sign=-1) an expense from the user's rollups."""
+    ops = _expense_ops(token, doc, sign)
+    if ops:
+        db.daily_rollups.bulk_write(ops, ordered=False)
+
+
+def record_expenses(token: str, docs: list):
+    """Add many new expenses at once, merging deltas that share a rollup row."""
+    deltas = {}
+    for doc in docs:
+        day, category = _expense_key(doc)
+        amount = float(doc.get("amount") or 0)
+        if day and amount:
+            deltas[(day, category)] = deltas.get((day, category), 0.0) + amount
+    if deltas:
+        db.daily_rollups.bulk_write(
+            [_inc(token, day, category, "spent", delta) for (day, category), delta in deltas.items()],
+            ordered=False,
+        )
+
+
+def move_expense(token: str, old: dict, new: dict):
+    """Shift an expense's contribution after its amount, category or date changed."""
+    if (_expense_key(old), old.get("amount")) == (_expense_key(new), new.get("amount")):
+        return
+    ops = _expense_ops(token, old, -1) + _expense_ops(token, new, 1)
+    if ops:
+        db.daily_rollups.bulk_write(ops, ordered=False)
+
+
+def _savings_ops(token: str, doc: dict):
+    day = _day(doc)
+    amount = float(doc.get("amount") or 0)
+    if not day or not amount:
+        return []
+    delta = amount if doc.get("type") == "add" else -amount
+    return [_inc(token, day, SAVINGS_CATEGORY, "saved", delta)]
+
+
+def record_savings(token: str, doc: dict, expense: dict = None):
+    """Add a savings movement, and the expense it paid for if any, in one write."""
+    ops = _savings_ops(token, doc)
+    if expense is not None:
+        ops += _expense_ops(token, expense, 1)
+    if ops:
+        db.daily_rollups.bulk_write(ops, ordered=False)
+
+
+def category_totals_query(token: str, start_day: str):
+    """(filter, projection) selecting a user's expense rollup rows since start_day."""
+    return (
+        {"token": token, "day": {"$gte": start_day}, "category": {"$ne": SAVINGS_CATEGORY}},
+        {"_id": 0, "category": 1, "spent": 1},
+    )
+
+
+def fold_category_totals(rows) -> dict:
+    totals = {}
+    for row in rows:
+        totals[row["category"]] = totals.get(row["category"], 0.0) + (row.get("spent") or 0.0)
+    return totals
+
+
+def category_totals(token: str, start_day: str) -> dict:
+    """Sum of spent per category for days >= start_day."""
+    return fold_category_totals(db.daily_rollups.find(*category_totals_query(token, start_day)))
+
+
+def rebuild_rollups(token: str = None) -> int:
+    """Recompute rollups from the raw expense and savings ledgers.
+
+    Rebuilds one user when ``token`` is given, otherwise every user. Writes
+    that land while a user is being rebuilt may be lost; rerun if needed.
+    Returns the number of users rebuilt.
+    """
+    if token:
+        tokens = [token]
+    else:
+        tokens = set(db.expenses.distinct("token")) | set(db.savings.distinct("token"))
+
+    for t in tokens:
+        rows = {}
+        projection = {"_id": 0, "date": 1, "occurred_at": 1, "category": 1, "amount": 1}
+        for doc in db.expenses.find({"token": t}, projection):
+            day, category = _expense_key(doc)
+            if day:
+                row = rows.setdefault((day, category), {"spent": 0.0, "saved": 0.0})
+                row["spent"] += float(doc.get("amount") or 0)
+        for doc in db.savings.find({"token": t}, {"_id": 0, "date": 1, "occurred_at": 1, "type": 1, "amount": 1}):
+            day = _day(doc)
+            if day:
+                amount = float(doc.get("amount") or 0)
+                row = rows.setdefault((day, SAVINGS_CATEGORY), {"spent": 0.0, "saved": 0.0})
+                row["saved"] += amount if doc.get("type") == "add" else -amount
+
+        db.daily_rollups.delete_many({"token": t})
+        if rows:
+            db.daily_rollups.insert_many([
+                {"token": t, "day": day, "category": category, **totals}
+                for (day, category), totals in rows.items()
+            ])
+        # Summaries and analytics read rollups; cached ETags must not outlive them
+        bump_version(t)
+    return len(tokens)
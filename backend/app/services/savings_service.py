@@ -0,0 +1,95 @@
+from pymongo.errors import DuplicateKeyError
+
+from app.config import db
+from app.utils.versioning import bump_version
+
+
+# One document per user in savings_balances holds running totals, kept in step
+# with the savings ledger by $inc so balance reads never scan the ledger.
+BALANCE_TOLERANCE = 0.005
+BALANCE_PROJECTION = {"_id": 0, "total_added": 1, "total_used": 1}
+# Ledger entries written before savings_balances existed carry no sync seq.
+# Only those are seeded into a new balance; every later entry is applied by its
+# own $inc, so concurrent first writes can never count an entry twice.
+PREDATES_BALANCES = {"seq": {"$exists": False}}
+
+
+def record_balance(token: str, doc: dict):
+    """Apply a new savings ledger entry to the user's running balance."""
+    field = "total_added" if doc.get("type") == "add" else "total_used"
+    inc = {"$inc": {field: float(doc.get("amount") or 0)}}
+    if db.savings_balances.update_one({"token": token}, inc).matched_count:
+        return
+    # First balance for this user: seed it (every racer seeds the same totals)
+    seed_balance(token, ledger_totals(token, PREDATES_BALANCES))
+    db.savings_balances.update_one({"token": token}, inc)
+
+
+def seed_balance(token: str, totals: dict) -> bool:
+    """Create the user's balance from ``totals`` unless it exists. True if created."""
+    try:
+        result = db.savings_balances.update_one({"token": token}, {"$setOnInsert": totals}, upsert=True)
+    except DuplicateKeyError:
+        return False  # a concurrent upsert created it first
+    return result.upserted_id is not None
+
+
+def ledger_pipeline(token: str, match: dict = None) -> list:
+    return [
+        {"$match": {"token": token, **(match or {})}},
+        {"$group": {"_id": "$type", "amount": {"$sum": "$amount"}}},
+    ]
+
+
+def totals_from_ledger(rows) -> dict:
+    totals = {"total_added": 0.0, "total_used": 0.0}
+    for row in rows:
+        if row["_id"] == "add":
+            totals["total_added"] = float(row["amount"])
+        elif row["_id"] == "use":
+            totals["total_used"] = float(row["amount"])
+    return totals
+
+
+def ledger_totals(token: str, match: dict = None) -> dict:
+    """Recompute a user's totals from the savings ledger (optionally filtered)."""
+    return totals_from_ledger(db.savings.aggregate(ledger_pipeline(token, match)))
+
+
+def balance_view(record: dict) -> dict:
+    added = float(record.get("total_added") or 0)
+    used = float(record.get("total_used") or 0)
+    return {"total_added": added, "total_used": used, "current_savings": added - used}
+
+
+def get_balance(token: str) -> dict:
+    """Return total_added, total_used and current_savings for a user.
+
+    Users whose ledger predates savings_balances are seeded from the ledger on
+    first read or first savings write, whichever comes first.
+    """
+    record = db.savings_balances.find_one({"token": token}, BALANCE_PROJECTION)
+    if record is None:
+        record = ledger_totals(token, PREDATES_BALANCES)
+        if seed_balance(token, record):
+            bump_version(token)
+    return balance_view(record)
+
+
+def reconcile_balances(token: str = None, fix: bool = False) -> list:
+    """Compare stored balances with the ledger and optionally overwrite drift.
+
+    Returns a list of (token, stored, expected) for every mismatch found.
+    """
+    tokens = [token] if token else db.savings.distinct("token")
+    mismatches = []
+    for t in tokens:
+        expected = ledger_totals(t)
+        stored = db.savings_balances.find_one({"token": t}, BALANCE_PROJECTION) or {}
+        drift = any(abs(float(stored.get(k) or 0) - expected[k]) > BALANCE_TOLERANCE for k in expected)
+        if drift:
+            mismatches.append((t, stored, expected))
+            if fix:
+                db.savings_balances.update_one({"token": t}, {"$set": expected}, upsert=True)
+                bump_version(t)
+    return mismatches
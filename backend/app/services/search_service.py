@@ -0,0 +1,75 @@
+from app.config import db
+from app.services.export_service import build_export_query
+from app.utils.pagination import decode_cursor, finish_page, keyset_filter, paginate
+from app.utils.serializers import EXPENSE_PROJECTION, serialize_documents
+
+
+# Ranking weights live on the text index (app/indexes.py)
+SEARCH_SORTS = ("relevance", "date")
+MAX_QUERY_LENGTH = 200
+
+
+def _amount(name: str, raw):
+    if raw is None or raw == "":
+        return None, None
+    try:
+        return float(raw), None
+    except (TypeError, ValueError):
+        return None, f"'{name}' must be a number"
+
+
+def build_search_query(token: str, text: str, start=None, end=None, category=None,
+                       min_amount=None, max_amount=None):
+    """Build the $text filter plus optional date/category/amount bounds. Returns (query, error)."""
+    text = (text or "").strip()
+    if not text:
+        return None, "q is required"
+    if len(text) > MAX_QUERY_LENGTH:
+        return None, f"q must be at most {MAX_QUERY_LENGTH} characters"
+    q, err = build_export_query(token, start, end, category)
+    if err:
+        return None, err
+    bounds = {}
+    for name, raw, op in (("min_amount", min_amount, "$gte"), ("max_amount", max_amount, "$lte")):
+        value, err = _amount(name, raw)
+        if err:
+            return None, err
+        if value is not None:
+            bounds[op] = value
+    if bounds:
+        q["amount"] = bounds
+    # The text index is prefixed by token, so this only reads the user's entries
+    q["$text"] = {"$search": text}
+    return q, None
+
+
+def search_expenses(token: str, query: dict, sort: str, limit: int, after: str = None):
+    """One page of search results; by text score, or newest first for sort=date.
+
+    Returns (page, error) like ``get_expenses``; relevance results carry ``score``.
+    """
+    try:
+        if sort == "date":
+            docs, next_cursor = paginate(db.expenses, query, "occurred_at", limit, after, EXPENSE_PROJECTION)
+        else:
+            docs, next_cursor = _by_relevance(query, limit, after)
+    except ValueError as e:
+        return None, str(e)
+    return {"items": serialize_documents(docs), "next_cursor": next_cursor}, None
+
+
+def _by_relevance(query: dict, limit: int, after: str = None):
+    # Keyset on (score, _id): the score is computed per query, so the cursor
+    # filter has to follow $addFields rather than join the $text match
+    pipeline = [
+        {"$match": query},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+    ]
+    if after:
+        pipeline.append({"$match": keyset_filter("score", *decode_cursor(after))})
+    pipeline += [
+        {"$sort": {"score": -1, "_id": -1}},
+        {"$limit": limit + 1},
+        {"$project": EXPENSE_PROJECTION},
+    ]
+    return finish_page(list(db.expenses.aggregate(pipeline)), limit, "score")
@@ -0,0 +1,102 @@
+import os
+from datetime import datetime
+
+from pymongo import ReturnDocument
+from werkzeug.http import http_date
+
+from app.config import db
+from app.utils.cache import MISSING, make_cache
+from app.utils.serializers import PRIVATE_FIELDS
+from app.utils.versioning import request_version
+
+
+# Settings change rarely but are read by summary, analytics and /settings/get.
+# With the default in-process backend each worker has its own copy. Entries
+# carry the data version they were read at: responses with an ETag only use an
+# entry from that same version, so another worker's write is seen at once.
+# Untagged reads (analytics) accept any entry and may lag by up to the TTL.
+# Use CACHE_BACKEND=redis to share entries between workers.
+_cache = make_cache(
+    "settings",
+    maxsize=int(os.getenv("SETTINGS_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("SETTINGS_CACHE_TTL", "300")),
+)
+
+
+DEFAULT_SETTINGS = {
+    "income": None,
+    "budget": None,
+    "notifications": {"budgetAlert": False, "largeExpense": False, "monthlyEmail": False},
+    "currency": "$",
+}
+
+
+def cached_settings(token: str, version: int = None):
+    """The cached record (possibly None) or MISSING; never touches the database.
+
+    With ``version``, an entry read at any other data version is a miss.
+    """
+    entry = _cache.get(token)
+    if entry is MISSING or (version is not None and entry["v"] != version):
+        return MISSING
+    record = entry["record"]
+    return dict(record) if record else None
+
+
+def remember_settings(token: str, record, version: int = None):
+    """Cache a record loaded by a read at ``version`` (None if unknown).
+
+    A versioned read replaces the entry, since versioned lookups ignore
+    entries from other versions. An unversioned one never replaces a newer
+    write-through.
+    """
+    entry = {"v": version, "record": record}
+    if version is None:
+        _cache.add(token, entry)
+    else:
+        _cache.set(token, entry)
+
+
+def get_settings_record(token: str):
+    """Return the user's settings document (without _id), or None."""
+    version = request_version(token)
+    record = cached_settings(token, version)
+    if record is MISSING:
+        record = db.settings.find_one({"token": token}, {"_id": 0})
+        remember_settings(token, record, version)
+    return dict(record) if record else None
+
+
+def settings_view(record):
+    """What /settings/get returns: the stored record, or defaults for new users."""
+    if not record:
+        return {**DEFAULT_SETTINGS, "notifications": dict(DEFAULT_SETTINGS["notifications"])}
+    for field in PRIVATE_FIELDS:
+        record.pop(field, None)
+    # Ensure currency default when missing in older records
+    if not record.get("currency"):
+        record["currency"] = "$"
+    # Kept in the HTTP-date format clients have always received for this field
+    if isinstance(record.get("updated_at"), datetime):
+        record["updated_at"] = http_date(record["updated_at"])
+    return record
+
+
+def save_settings_record(token: str, fields: dict, version: int = None) -> dict:
+    """Upsert the user's settings and write the stored result through the cache.
+
+    ``version`` is the data version begin_change returned for this write.
+    """
+    record = db.settings.find_one_and_update(
+        {"token": token},
+        {"$set": {**fields, "updated_at": datetime.utcnow()}},
+        projection={"_id": 0},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    _cache.set(token, {"v": version, "record": record})
+    return record
+
+
+def invalidate_settings(token: str):
+    _cache.delete(token)
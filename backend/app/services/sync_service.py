@@ -0,0 +1,96 @@
+import base64
+import json
+import os
+from datetime import datetime, timedelta
+
+from app.config import db
+from app.services.settings_service import settings_view
+from app.utils.serializers import EXPENSE_PROJECTION, SAVINGS_PROJECTION, serialize_documents
+from app.utils.versioning import current_change_seq
+
+
+# Every write stamps its documents with the user's next change sequence
+# (data_versions.seq) and deletions leave a tombstone carrying one, so
+# "changed since N" is an indexed range read. A cursor is (seq, time): writes
+# that took a sequence number before the cursor was issued but committed after
+# it are caught by re-reading anything updated within SYNC_OVERLAP of that time.
+SYNC_OVERLAP = timedelta(seconds=int(os.getenv("SYNC_OVERLAP_SECONDS", "30")))
+# Tombstones expire; a cursor older than this can no longer see every delete
+TOMBSTONE_TTL_DAYS = int(os.getenv("SYNC_TOMBSTONE_TTL_DAYS", "30"))
+# Above this many changed documents a client is told to refetch instead
+SYNC_MAX_CHANGES = int(os.getenv("SYNC_MAX_CHANGES", "1000"))
+
+SYNCED = {"expenses": EXPENSE_PROJECTION, "savings": SAVINGS_PROJECTION}
+RESET = "*"
+
+
+def record_tombstones(token: str, collection: str, ids: list, seq: int):
+    now = datetime.utcnow()
+    if ids:
+        db.tombstones.insert_many([
+            {"token": token, "collection": collection, "id": str(i), "seq": seq, "at": now} for i in ids
+        ])
+
+
+def record_reset(token: str, seq: int):
+    """Replace the user's tombstones with one marker meaning 'everything was deleted'."""
+    db.tombstones.delete_many({"token": token})
+    db.tombstones.insert_one({"token": token, "collection": RESET, "seq": seq, "at": datetime.utcnow()})
+
+
+def encode_sync_cursor(seq: int, at: datetime) -> str:
+    raw = json.dumps([seq, at.isoformat()], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sync_cursor(cursor: str):
+    """Inverse of ``encode_sync_cursor``. Raises ValueError on malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        seq, at = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(seq), datetime.fromisoformat(at)
+    except (TypeError, ValueError) as e:
+        raise ValueError("invalid cursor") from e
+
+
+def changed_since(token: str, seq: int, at: datetime, time_field: str = "updated_at") -> dict:
+    return {"token": token, "$or": [{"seq": {"$gt": seq}}, {time_field: {"$gte": at - SYNC_OVERLAP}}]}
+
+
+def sync_changes(token: str, since: str = None):
+    """Changes to a user's expenses, savings and settings after ``since``.
+
+    Without ``since`` only a fresh cursor is returned: take one, load the full
+    state through the regular endpoints, then poll with it. Returns
+    (payload, cursor, error).
+    """
+    # Issued before reading, so anything committed after this point is newer
+    now = datetime.utcnow()
+    cursor = encode_sync_cursor(current_change_seq(token), now)
+    if not since:
+        return {"full_resync": True}, cursor, None
+    try:
+        seq, at = decode_sync_cursor(since)
+    except ValueError as e:
+        return None, None, str(e)
+    if at < now - timedelta(days=TOMBSTONE_TTL_DAYS):
+        return {"full_resync": True}, cursor, None
+
+    payload = {"full_resync": False, "reset": False, "deleted": {name: [] for name in SYNCED}}
+    for stone in db.tombstones.find(changed_since(token, seq, at, "at"), {"_id": 0}).sort("seq", 1):
+        if stone["collection"] == RESET:
+            # Anything deleted before the reset is moot; the client starts over
+            payload["reset"] = True
+            payload["deleted"] = {name: [] for name in SYNCED}
+        elif stone["collection"] in payload["deleted"]:
+            payload["deleted"][stone["collection"]].append(stone["id"])
+
+    for name, projection in SYNCED.items():
+        docs = list(db[name].find(changed_since(token, seq, at), projection).limit(SYNC_MAX_CHANGES + 1))
+        if len(docs) > SYNC_MAX_CHANGES:
+            return {"full_resync": True}, cursor, None
+        payload[name] = serialize_documents(docs)
+
+    settings = db.settings.find_one(changed_since(token, seq, at), {"_id": 0})
+    payload["settings"] = settings_view(settings) if settings else None
+    return payload, cursor, None
@@ -0,0 +1,56 @@
+import os
+
+from flask import g, request
+
+from app.utils.cache import MISSING, make_cache
+
+
+# token -> user record. Unknown tokens are cached too (for a shorter TTL) so a
+# client retrying with a bad token does not hit the users collection each time.
+_cache = make_cache(
+    "auth_tokens",
+    maxsize=int(os.getenv("AUTH_CACHE_SIZE", "50000")),
+    ttl=float(os.getenv("AUTH_CACHE_TTL", "300")),
+)
+NEGATIVE_TTL = float(os.getenv("AUTH_NEGATIVE_TTL", "30"))
+
+_USER_PROJECTION = {"_id": 1, "google_id": 1, "email": 1, "name": 1}
+
+
+def request_token():
+    """The caller's token from the query string or, failing that, the JSON body."""
+    token = request.args.get("token")
+    if not token:
+        token = (request.get_json(silent=True) or {}).get("token")
+    return token if isinstance(token, str) and token else None
+
+
+def resolve_token(token: str):
+    """Return the user record for a token, or None if no user owns it."""
+    user = _cache.get(token)
+    if user is not MISSING:
+        return user
+    from app.config import db
+
+    # OAuth logins issue 'access_token'; the legacy id_token flow stored 'token'
+    user = db.users.find_one(
+        {"$or": [{"access_token": token}, {"token": token}]},
+        _USER_PROJECTION,
+    )
+    _cache.set(token, user, ttl=None if user else NEGATIVE_TTL)
+    return user
+
+
+def load_request_user():
+    """before_request hook: expose g.token and the resolved g.user to views."""
+    g.token = None
+    g.user = None
+    if request.method == "OPTIONS":
+        return
+    g.token = request_token()
+    if g.token:
+        g.user = resolve_token(g.token)
+
+
+def init_auth(app):
+    app.before_request(load_request_user)
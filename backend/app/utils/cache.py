@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import bson
+
+
+# Returned by get() on a miss, so None can be cached as a real value
+MISSING = object()
+# delete() leaves a marker this long so a reader that loaded the old value
+# before the delete cannot add() it back afterwards
+INVALIDATION_GRACE = 5.0
+_INVALIDATED = object()
+
+
+class MemoryCache:
+    """Thread-safe, size-bounded LRU cache with a per-entry TTL."""
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 60.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now or entry[1] is _INVALIDATED:
+                if entry is not None and entry[0] <= now:
+                    del self._data[key]
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl: float = None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._store(key, expires, value)
+
+    def add(self, key, value, ttl: float = None) -> bool:
+        """Set only if the key holds nothing (not even a recent delete).
+
+        For filling the cache from a read: a concurrent write-through or
+        invalidation wins over the possibly older value the reader loaded.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                return False
+            self._store(key, now + (self.ttl if ttl is None else ttl), value)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._store(key, time.monotonic() + INVALIDATION_GRACE, _INVALIDATED)
+
+    def _store(self, key, expires, value):
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        return {"name": self.name, "hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+class RedisCache:
+    """Same interface as MemoryCache, backed by a Redis-compatible server.
+
+    Lets several worker processes share entries and see each other's
+    invalidations. Values are BSON-encoded so datetimes round-trip. Requires
+    the optional ``redis`` package. Hit/miss counters are per process.
+    """
+
+    def __init__(self, name: str, url: str, ttl: float = 60.0):
+        import redis
+
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._client = redis.Redis.from_url(url)
+        self._prefix = f"cache:{name}:"
+
+    def get(self, key):
+        raw = self._client.get(self._prefix + key)
+        if not raw:  # absent, or the empty marker left by delete()
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        return bson.decode(raw)["v"]
+
+    def set(self, key, value, ttl: float = None):
+        ms = int((self.ttl if ttl is None else ttl) * 1000)
+        self._client.set(self._prefix + key, bson.encode({"v": value}), px=max(ms, 1))
+
+    def add(self, key, value, ttl: float = None) -> bool:
+        ms = int((self.ttl if ttl is None else ttl) * 1000)
+        return bool(self._client.set(self._prefix + key, bson.encode({"v": value}), px=max(ms, 1), nx=True))
+
+    def delete(self, key):
+        self._client.set(self._prefix + key, b"", px=int(INVALIDATION_GRACE * 1000))
+
+    def clear(self):
+        for k in self._client.scan_iter(self._prefix + "*"):
+            self._client.delete(k)
+
+    def stats(self) -> dict:
+        return {"name": self.name, "hits": self.hits, "misses": self.misses}
+
+
+_registry = []
+
+
+def make_cache(name: str, maxsize: int = 1024, ttl: float = 60.0):
+    """Build a cache using the backend selected by CACHE_BACKEND (memory|redis)."""
+    backend = os.getenv("CACHE_BACKEND", "memory").lower()
+    if backend == "redis":
+        cache = RedisCache(name, os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"), ttl)
+    else:
+        cache = MemoryCache(name, maxsize, ttl)
+    _registry.append(cache)
+    return cache
+
+
+def cache_stats() -> list:
+    """Hit/miss counters for every cache created through make_cache."""
+    return [c.stats() for c in _registry]
+
+
+def _collect_cache_metrics():
+    from app.utils.metrics import Gauge
+
+    gauges = {
+        key: Gauge(f"cache_{key}", f"{doc}, by cache, in this process.", ("cache",))
+        for key, doc in (("hits", "Lookups served from the cache"), ("misses", "Lookups that missed"),
+                         ("size", "Entries held (memory backend only)"))
+    }
+    for stats in cache_stats():
+        for key, gauge in gauges.items():
+            if key in stats:
+                gauge.set(stats["name"], value=stats[key])
+    return list(gauges.values())
+
+
+def _register_metrics():
+    from app.utils.metrics import REGISTRY
+
+    REGISTRY.add_collector(_collect_cache_metrics)
+
+
+_register_metrics()
@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+
+
+def day_key(value):
+    """Return the 'YYYY-MM-DD' bucket for an ISO string or datetime, else None."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, str) and len(value) >= 10:
+        return value[:10]
+    return None
+
+
+def to_utc_datetime(value):
+    """Parse an ISO string or datetime into a naive UTC datetime, else None.
+
+    Naive values are taken as UTC, matching how pymongo returns BSON dates.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def occurred_range(start=None, end=None) -> dict:
+    """Query fragment selecting ledger documents with start <= occurred_at < end."""
+    bounds = {}
+    if start is not None:
+        bounds["$gte"] = start
+    if end is not None:
+        bounds["$lt"] = end
+    return {"occurred_at": bounds} if bounds else {}
@@ -0,0 +1,219 @@
+"""Per-user change events for the server-sent events stream (/api/events).
+
+Write paths call ``publish_event``; the broker delivers the formatted message
+to the ``EventHub`` of every worker, which hands it to that worker's open
+streams for the user. EVENTS_BROKER selects the broker like CACHE_BACKEND
+selects the cache: ``memory`` (default) only reaches streams in the same
+process, ``redis`` fans out through Redis pub/sub so any worker's write
+reaches every worker's streams.
+
+Each stream has a small bounded buffer. A stream that falls behind is told to
+resync (through /api/sync) and closed rather than buffering without limit.
+"""
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+
+from flask import current_app
+
+
+EVENTS_BUFFER = int(os.getenv("EVENTS_BUFFER", "100"))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+HEARTBEAT = ": ping\n\n"
+RESYNC = "event: resync\ndata: {}\n\n"
+# Longest wait between Redis reconnect attempts, in seconds
+REDIS_MAX_BACKOFF = 30
+
+
+def format_sse(event_type: str, payload, seq=None) -> str:
+    body = current_app.json.dumps({"type": event_type, "data": payload}, sort_keys=False)
+    head = f"id: {seq}\n" if seq is not None else ""
+    return f"{head}event: {event_type}\ndata: {body}\n\n"
+
+
+class Subscription:
+    """Blocking consumer for a thread-per-connection (WSGI) stream."""
+
+    def __init__(self, maxsize: int = EVENTS_BUFFER):
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def __call__(self, message: str):
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout: float):
+        """Next message, or None once ``timeout`` passes without one."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AsyncSubscription:
+    """Consumer for an asyncio stream; costs one small queue per connection."""
+
+    def __init__(self, maxsize: int = EVENTS_BUFFER):
+        self.overflowed = False
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=maxsize)
+
+    def __call__(self, message: str):
+        # Publishers run on worker threads; hand over to the stream's loop
+        self._loop.call_soon_threadsafe(self._offer, message)
+
+    def _offer(self, message: str):
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout: float):
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventHub:
+    """This process's open streams, by user token."""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, token: str, sink):
+        with self._lock:
+            self._subscribers.setdefault(token, set()).add(sink)
+
+    def unsubscribe(self, token: str, sink):
+        with self._lock:
+            sinks = self._subscribers.get(token)
+            if sinks is not None:
+                sinks.discard(sink)
+                if not sinks:
+                    del self._subscribers[token]
+
+    def dispatch(self, token: str, message: str):
+        with self._lock:
+            sinks = list(self._subscribers.get(token, ()))
+        for sink in sinks:
+            try:
+                sink(message)
+            except Exception as e:
+                # e.g. the stream's event loop already closed; it unsubscribes itself
+                print(f"[events] dropped a message for a dead stream: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self._subscribers),
+                "connections": sum(len(s) for s in self._subscribers.values()),
+            }
+
+
+class LocalBroker:
+    """Delivers straight to this process's hub."""
+
+    def __init__(self, hub: EventHub):
+        self.hub = hub
+
+    def publish(self, token: str, message: str):
+        self.hub.dispatch(token, message)
+
+    def listen(self):
+        pass
+
+
+class RedisBroker:
+    """Fans events out to every worker through one Redis pub/sub channel.
+
+    Any Redis-compatible server works, including a local one standing in for
+    a shared deployment. Requires the optional ``redis`` package. Workers
+    only subscribe once they hold a stream, so publish-only workers stay idle.
+    """
+
+    def __init__(self, hub: EventHub, url: str, channel: str = "events"):
+        import redis
+
+        self.hub = hub
+        self.channel = channel
+        self._client = redis.Redis.from_url(url)
+        self._listener_pid = None
+        self._lock = threading.Lock()
+
+    def publish(self, token: str, message: str):
+        self._client.publish(self.channel, json.dumps([token, message]))
+
+    def listen(self):
+        if self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener_pid != os.getpid():
+                threading.Thread(target=self._run, name="events-redis", daemon=True).start()
+                self._listener_pid = os.getpid()
+
+    def _run(self):
+        delay = 0.5
+        try:
+            while True:
+                try:
+                    pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(self.channel)
+                    delay = 0.5
+                    for item in pubsub.listen():
+                        try:
+                            token, message = json.loads(item["data"])
+                        except (TypeError, ValueError):
+                            continue
+                        self.hub.dispatch(token, message)
+                except Exception as e:
+                    # Redis restarted or the connection dropped; events sent
+                    # meanwhile are lost, so clients catch up through /api/sync
+                    print(f"[events] redis listener reconnecting in {delay:.1f}s: {e}")
+                    time.sleep(delay)
+                    delay = min(delay * 2, REDIS_MAX_BACKOFF)
+        finally:
+            # Let the next listen() start a fresh listener
+            self._listener_pid = None
+
+
+def make_broker(hub: EventHub):
+    """Build the broker selected by EVENTS_BROKER (memory|redis)."""
+    if os.getenv("EVENTS_BROKER", "memory").lower() == "redis":
+        return RedisBroker(hub, os.getenv("EVENTS_REDIS_URL", "redis://localhost:6379/0"))
+    return LocalBroker(hub)
+
+
+hub = EventHub()
+broker = make_broker(hub)
+
+
+def publish_event(token: str, event_type: str, payload=None, seq=None):
+    """Notify the user's open streams. Never fails the write that triggered it."""
+    try:
+        broker.publish(token, format_sse(event_type, payload, seq))
+    except Exception as e:
+        print(f"[events] could not publish {event_type}: {e}")
+
+
+def open_stream(token: str, subscription):
+    """Register ``subscription`` for the user's events and start listening."""
+    broker.listen()
+    hub.subscribe(token, subscription)
+    return subscription
+
+
+def _register_metrics():
+    from app.utils.metrics import REGISTRY, snapshot_gauges
+
+    REGISTRY.add_collector(snapshot_gauges("sse", hub.stats, "Open server-sent event streams"))
+
+
+_register_metrics()
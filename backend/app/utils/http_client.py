@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# (connect, read) seconds for outbound calls; login blocks a worker on these
+HTTP_TIMEOUT = (
+    float(os.getenv("HTTP_CONNECT_TIMEOUT", "3")),
+    float(os.getenv("HTTP_READ_TIMEOUT", "8")),
+)
+
+_local_pid = None
+_session = None
+_session_lock = threading.Lock()
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    # Connection failures are retried for any method (nothing was sent);
+    # gateway errors only for GET, since an auth code can be redeemed once.
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=0,
+        status=2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        backoff_factor=0.2,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=int(os.getenv("HTTP_POOL_CONNECTIONS", "4")),
+        pool_maxsize=int(os.getenv("HTTP_POOL_MAXSIZE", "32")),
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Keep-alive session shared by the process, rebuilt after a fork."""
+    global _local_pid, _session
+    if _local_pid != os.getpid():
+        with _session_lock:
+            if _local_pid != os.getpid():
+                _session = _build_session()
+                _local_pid = os.getpid()
+    return _session
+
+
+def timed_request(name: str, method: str, url: str, **kwargs) -> requests.Response:
+    """Issue a request on the shared session and record its latency under ``name``."""
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    started = time.perf_counter()
+    failed = False
+    try:
+        return get_session().request(method, url, **kwargs)
+    except requests.RequestException:
+        failed = True
+        raise
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        with _stats_lock:
+            s = _stats.setdefault(name, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            s["count"] += 1
+            s["errors"] += int(failed)
+            s["total_ms"] += elapsed
+            s["max_ms"] = max(s["max_ms"], elapsed)
+
+
+def http_stats() -> dict:
+    """Per-call-name request counts, errors and average/max latency in ms."""
+    with _stats_lock:
+        return {
+            name: {
+                "count": s["count"],
+                "errors": s["errors"],
+                "avg_ms": round(s["total_ms"] / s["count"], 3) if s["count"] else 0.0,
+                "max_ms": round(s["max_ms"], 3),
+            }
+            for name, s in _stats.items()
+        }
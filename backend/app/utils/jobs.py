@@ -0,0 +1,335 @@
+"""Background jobs for per-user operations too slow for a request.
+
+A job is a document in the ``jobs`` collection; the request that starts it
+only inserts that document and returns its id. Each process runs a small
+worker pool that claims queued jobs with an atomic status update, so any
+worker can run any job and a job survives the process that queued it. The
+handler reports progress through ``Job.progress`` / ``Job.advance``, which
+also heartbeats and raises ``JobCancelled`` once the user asks to cancel.
+A running job whose heartbeat goes stale (its worker died) is claimed again,
+so handlers must be safe to rerun from the start.
+"""
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from flask import current_app
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+
+JOB_COLLECTION = "jobs"
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# How often idle workers look for jobs queued by other processes
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "5"))
+# A running job that has not reported progress for this long is run again
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "300"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Documents per write in chunked handlers
+JOB_CHUNK = int(os.getenv("JOB_CHUNK", "1000"))
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+HANDLERS = {}
+ABANDON_HOOKS = {}
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def register_job(kind: str, on_abandon=None):
+    """Decorator registering ``handler(job) -> result`` for jobs of ``kind``.
+
+    ``on_abandon(job)`` runs instead of the handler when a job is given up
+    after JOB_MAX_ATTEMPTS, to clean up after the attempt whose worker died.
+    """
+    def decorator(handler):
+        HANDLERS[kind] = handler
+        if on_abandon is not None:
+            ABANDON_HOOKS[kind] = on_abandon
+        return handler
+
+    return decorator
+
+
+def _jobs():
+    from app.config import db
+
+    return db[JOB_COLLECTION]
+
+
+def _job_id(job_id):
+    try:
+        return ObjectId(job_id)
+    except (TypeError, InvalidId):
+        return None
+
+
+class Job:
+    """What a handler sees: its parameters and a way to report progress."""
+
+    def __init__(self, doc: dict):
+        self.id = doc["_id"]
+        self.token = doc["token"]
+        self.kind = doc["kind"]
+        self.params = doc.get("params") or {}
+        self.created_at = doc["created_at"]
+        progress = doc.get("progress") or {}
+        self.done = progress.get("done", 0)
+        self.total = progress.get("total")
+
+    def progress(self, done: int = None, total: int = None, stage: str = None):
+        """Store progress, heartbeat, and raise JobCancelled if cancellation was requested."""
+        if done is not None:
+            self.done = done
+        if total is not None:
+            self.total = total
+        fields = {"progress.done": self.done, "progress.total": self.total, "heartbeat_at": datetime.utcnow()}
+        if stage is not None:
+            fields["progress.stage"] = stage
+        doc = _jobs().find_one_and_update(
+            {"_id": self.id}, {"$set": fields}, projection={"cancel_requested": 1},
+        )
+        if doc and doc.get("cancel_requested"):
+            raise JobCancelled()
+
+    def advance(self, count: int):
+        self.progress(self.done + count)
+
+
+def delete_in_chunks(job: Job, collection, query: dict, chunk: int = JOB_CHUNK) -> int:
+    """Delete matching documents JOB_CHUNK at a time, advancing ``job`` after each."""
+    deleted = 0
+    while True:
+        ids = [d["_id"] for d in collection.find(query, {"_id": 1}).limit(chunk)]
+        if not ids:
+            return deleted
+        deleted += collection.delete_many({"_id": {"$in": ids}}).deleted_count
+        job.advance(len(ids))
+
+
+def job_view(doc: dict) -> dict:
+    """What the jobs API returns; never includes the owner's token."""
+    return {
+        "id": str(doc["_id"]),
+        "kind": doc.get("kind"),
+        "status": doc.get("status"),
+        "progress": doc.get("progress") or {},
+        "result": doc.get("result"),
+        "error": doc.get("error"),
+        "cancel_requested": bool(doc.get("cancel_requested")),
+        "created_at": doc.get("created_at"),
+        "started_at": doc.get("started_at"),
+        "finished_at": doc.get("finished_at"),
+    }
+
+
+class JobRunner:
+    """Per-process worker pool; started lazily so idle processes spawn nothing."""
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.workers = workers
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._slots = None
+        self._executor = None
+        self._app = None
+        self._running = 0
+
+    def start(self, app):
+        if self._pid == os.getpid():
+            self._wake.set()
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # Fresh pool per process: threads do not survive a fork
+                self._app = app
+                self._slots = threading.Semaphore(self.workers)
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jobs")
+                threading.Thread(target=self._dispatch, name="jobs-dispatch", daemon=True).start()
+                self._pid = os.getpid()
+        self._wake.set()
+
+    def stats(self) -> dict:
+        return {"workers": self.workers if self._pid == os.getpid() else 0, "running": self._running}
+
+    def _dispatch(self):
+        while True:
+            self._slots.acquire()
+            try:
+                with self._app.app_context():
+                    doc = self._claim()
+            except Exception as e:
+                print(f"[jobs] could not claim a job: {e}")
+                doc = None
+            if doc is None:
+                self._slots.release()
+                self._wake.wait(JOB_POLL_SECONDS)
+                self._wake.clear()
+                continue
+            self._executor.submit(self._run, doc)
+
+    @staticmethod
+    def _claim():
+        now = datetime.utcnow()
+        return _jobs().find_one_and_update(
+            {"$or": [
+                {"status": QUEUED},
+                {"status": RUNNING, "heartbeat_at": {"$lt": now - timedelta(seconds=JOB_STALE_SECONDS)}},
+            ]},
+            {
+                "$set": {"status": RUNNING, "started_at": now, "heartbeat_at": now,
+                         "worker": f"{socket.gethostname()}:{os.getpid()}"},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def _run(self, doc: dict):
+        with self._lock:
+            self._running += 1
+        try:
+            with self._app.app_context():
+                self._execute(doc)
+        finally:
+            with self._lock:
+                self._running -= 1
+            self._slots.release()
+
+    def _execute(self, doc: dict):
+        handler = HANDLERS.get(doc["kind"])
+        if handler is None:
+            return _finish(doc, FAILED, error=f"unknown job kind {doc['kind']!r}")
+        if doc.get("attempts", 1) > JOB_MAX_ATTEMPTS:
+            hook = ABANDON_HOOKS.get(doc["kind"])
+            if hook is not None:
+                try:
+                    hook(Job(doc))
+                except Exception as e:
+                    print(f"[jobs] cleanup of abandoned {doc['kind']} {doc['_id']} failed: {e}")
+            return _finish(doc, FAILED, error=f"gave up after {JOB_MAX_ATTEMPTS} attempts")
+        try:
+            result = handler(Job(doc))
+        except JobCancelled:
+            return _finish(doc, CANCELLED)
+        except Exception as e:
+            print(f"[jobs] {doc['kind']} {doc['_id']} failed: {e}")
+            return _finish(doc, FAILED, error=str(e)[:500])
+        _finish(doc, SUCCEEDED, result=result)
+
+
+def _finish(doc: dict, status: str, result=None, error: str = None):
+    from app.utils.events import publish_event
+
+    saved = _jobs().find_one_and_update(
+        {"_id": doc["_id"]},
+        {
+            "$set": {"status": status, "result": result, "error": error, "finished_at": datetime.utcnow()},
+            "$unset": {"active_key": ""},
+        },
+        return_document=ReturnDocument.AFTER,
+    )
+    if saved:
+        publish_event(saved["token"], "job.finished", job_view(saved))
+
+
+runner = JobRunner()
+
+
+def _active_key(token: str, kind: str) -> str:
+    return f"{kind}:{token}"
+
+
+def submit_job(token: str, kind: str, params: dict = None) -> dict:
+    """Queue a job and return its document.
+
+    A user's unfinished job of the same kind is returned instead of queueing
+    a duplicate, so a double-clicked button starts one job. Queued and running
+    jobs carry ``active_key`` (kind:token) under a sparse unique index, which
+    keeps that true even for concurrent submits.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"unknown job kind {kind!r}")
+    jobs = _jobs()
+    while True:
+        doc = {
+            "token": token,
+            "kind": kind,
+            "params": params or {},
+            "status": QUEUED,
+            "active_key": _active_key(token, kind),
+            "progress": {"done": 0, "total": None},
+            "attempts": 0,
+            "cancel_requested": False,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            jobs.insert_one(doc)
+            break
+        except DuplicateKeyError:
+            pending = jobs.find_one({"active_key": _active_key(token, kind)})
+            if pending is not None:
+                doc = pending
+                break
+            # It finished between the insert and the lookup; queue a new one
+    runner.start(current_app._get_current_object())
+    return doc
+
+
+def get_job(token: str, job_id: str):
+    """The user's job, or None if the id is unknown or belongs to someone else."""
+    oid = _job_id(job_id)
+    if oid is None:
+        return None
+    doc = _jobs().find_one({"_id": oid, "token": token})
+    if doc is not None and doc["status"] not in FINISHED:
+        # Someone is waiting on it; make sure this process is working the queue
+        runner.start(current_app._get_current_object())
+    return doc
+
+
+def list_jobs(token: str, limit: int = 20) -> list:
+    return list(_jobs().find({"token": token}).sort("created_at", -1).limit(limit))
+
+
+def cancel_job(token: str, job_id: str):
+    """Cancel a queued job outright, or ask a running one to stop at its next chunk.
+
+    Returns the updated job, or None if it does not exist for this user.
+    """
+    oid = _job_id(job_id)
+    if oid is None:
+        return None
+    jobs = _jobs()
+    doc = jobs.find_one_and_update(
+        {"_id": oid, "token": token, "status": QUEUED},
+        {
+            "$set": {"status": CANCELLED, "cancel_requested": True, "finished_at": datetime.utcnow()},
+            "$unset": {"active_key": ""},
+        },
+        return_document=ReturnDocument.AFTER,
+    )
+    if doc is None:
+        doc = jobs.find_one_and_update(
+            {"_id": oid, "token": token, "status": RUNNING},
+            {"$set": {"cancel_requested": True}},
+            return_document=ReturnDocument.AFTER,
+        )
+    return doc or jobs.find_one({"_id": oid, "token": token})
+
+
+def _register_metrics():
+    from app.utils.metrics import REGISTRY, snapshot_gauges
+
+    REGISTRY.add_collector(snapshot_gauges("jobs", runner.stats, "Background job workers in this process"))
+
+
+_register_metrics()
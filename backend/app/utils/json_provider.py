@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from bson import ObjectId
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib fallback emits the same JSON, slower
+    orjson = None
+
+
+class MongoJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that understands Mongo documents.
+
+    Datetimes are written as ISO 8601 (what the serializers used to produce by
+    hand) and ObjectIds as their hex string, so handlers can return documents
+    straight from the driver. Uses orjson when installed.
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        if isinstance(o, ObjectId):
+            return str(o)
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
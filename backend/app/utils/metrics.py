@@ -0,0 +1,230 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Deliberately small: counters, gauges and fixed-bucket histograms keyed by label
+values, each guarded by one lock, so recording costs a dict lookup and a
+bisect. Values are per process; with several workers each scrape sees the
+worker that answered it, so scrape workers individually or sum in Prometheus.
+"""
+import bisect
+import threading
+import time
+
+from flask import g, request
+from pymongo import monitoring
+
+
+# Request and Mongo command latencies, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _num(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # per-bucket (non-cumulative) counts, sum, count
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> list:
+        with self._lock:
+            items = [(k, (list(s[0]), s[1], s[2])) for k, s in self._values.items()]
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_num(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_num(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collect):
+        """``collect()`` returns a list of ready metrics, evaluated per scrape."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            for metric in collect():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling a request, by blueprint and endpoint.",
+    ("blueprint", "endpoint", "method", "status"),
+))
+REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled, by blueprint.",
+    ("blueprint",),
+))
+MONGO_COMMAND_LATENCY = REGISTRY.register(Histogram(
+    "mongo_command_duration_seconds",
+    "Server round trip of MongoDB commands, by collection and command.",
+    ("collection", "command"),
+))
+MONGO_COMMAND_FAILURES = REGISTRY.register(Counter(
+    "mongo_command_failures_total",
+    "MongoDB commands that returned an error, by collection and command.",
+    ("collection", "command"),
+))
+
+
+def _route_labels():
+    # Unmatched URLs share one label so scanners cannot blow up cardinality
+    return request.blueprint or "", request.endpoint or "unmatched"
+
+
+def _start_timer():
+    blueprint, _ = _route_labels()
+    g._metrics_started = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc(blueprint)
+
+
+def _record_request(response):
+    started = g.get("_metrics_started")
+    if started is not None:
+        blueprint, endpoint = _route_labels()
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - started, blueprint, endpoint, request.method, str(response.status_code)
+        )
+    return response
+
+
+def _finish_request(exc):
+    if g.pop("_metrics_started", None) is not None:
+        REQUESTS_IN_FLIGHT.dec(_route_labels()[0])
+
+
+def init_metrics(app):
+    """Time every request; register before other hooks so they are included."""
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    app.teardown_request(_finish_request)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Feeds the mongo_command_* metrics from pymongo command events."""
+
+    def __init__(self):
+        self._pending = {}
+
+    def started(self, event):
+        command = event.command
+        target = command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = command.get("collection")
+        collection = target if isinstance(target, str) else ""
+        self._pending[(event.connection_id, event.request_id)] = (collection, event.command_name)
+
+    def _finish(self, event, failed: bool):
+        labels = self._pending.pop((event.connection_id, event.request_id), None)
+        if labels is None:
+            return
+        MONGO_COMMAND_LATENCY.observe(event.duration_micros / 1e6, *labels)
+        if failed:
+            MONGO_COMMAND_FAILURES.inc(*labels)
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+
+def snapshot_gauges(prefix: str, snapshot, documentation: str):
+    """Collector exposing each numeric field of ``snapshot()`` as a gauge."""
+    def collect():
+        metrics = []
+        for key, value in snapshot().items():
+            if isinstance(value, (int, float)):
+                gauge = Gauge(f"{prefix}_{key}", f"{documentation} ({key}).")
+                gauge.set(value=value)
+                metrics.append(gauge)
+        return metrics
+
+    return collect
@@ -0,0 +1,100 @@
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def parse_limit(raw, default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE):
+    """Parse a ``limit`` query param. Returns (limit, error)."""
+    if raw is None or raw == "":
+        return default, None
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        return None, "'limit' must be an integer"
+    if limit < 1:
+        return None, "'limit' must be >= 1"
+    return min(limit, maximum), None
+
+
+def encode_cursor(sort_value, doc_id) -> str:
+    """Build an opaque cursor from the last document's (sort_key, _id)."""
+    if isinstance(sort_value, datetime):
+        key = ["dt", sort_value.isoformat()]
+    else:
+        key = ["v", sort_value]
+    raw = json.dumps([key, str(doc_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Inverse of ``encode_cursor``. Raises ValueError on malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        (kind, value), doc_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if kind == "dt":
+            value = datetime.fromisoformat(value)
+        elif kind != "v":
+            raise ValueError(kind)
+        return value, ObjectId(doc_id)
+    except (TypeError, ValueError, InvalidId) as e:
+        raise ValueError("invalid cursor") from e
+
+
+def keyset_filter(field: str, sort_value, doc_id) -> dict:
+    """Match documents strictly after (sort_value, doc_id) in descending order.
+
+    Documents missing ``field`` sort last, so they are still reachable once the
+    cursor has passed every document that has the field.
+    """
+    if sort_value is None:
+        return {field: None, "_id": {"$lt": doc_id}}
+    return {
+        "$or": [
+            {field: {"$lt": sort_value}},
+            {field: sort_value, "_id": {"$lt": doc_id}},
+            {field: None},
+        ]
+    }
+
+
+def page_filter(query: dict, sort_field: str, after=None) -> dict:
+    """Restrict ``query`` to documents after the ``after`` cursor, if any.
+
+    Raises ValueError if ``after`` is not a valid cursor.
+    """
+    if not after:
+        return dict(query)
+    sort_value, doc_id = decode_cursor(after)
+    return {"$and": [query, keyset_filter(sort_field, sort_value, doc_id)]}
+
+
+def page_sort(sort_field: str) -> list:
+    return [(sort_field, -1), ("_id", -1)]
+
+
+def finish_page(docs: list, limit: int, sort_field: str):
+    """Trim a limit+1 fetch to ``limit`` docs and derive the next cursor."""
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor(last.get(sort_field), last["_id"])
+    return docs, next_cursor
+
+
+def paginate(collection, query: dict, sort_field: str, limit: int, after=None, projection=None):
+    """Fetch one page ordered by (sort_field, _id) descending.
+
+    Returns (docs, next_cursor); next_cursor is None on the last page.
+    Raises ValueError if ``after`` is not a valid cursor.
+    """
+    q = page_filter(query, sort_field, after)
+    docs = list(collection.find(q, projection).sort(page_sort(sort_field)).limit(limit + 1))
+    return finish_page(docs, limit, sort_field)
@@ -0,0 +1,74 @@
+import threading
+import time
+
+from pymongo import monitoring
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Counts connection checkouts and how long callers waited for one."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checked_out = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.connections_created = 0
+        self.connections_closed = 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checked_out": self.checked_out,
+                "wait_avg_ms": round(self.wait_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+                "connections_open": self.connections_created - self.connections_closed,
+            }
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "started", None)
+        waited = (time.perf_counter() - started) * 1000 if started else 0.0
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.wait_total_ms += waited
+            self.wait_max_ms = max(self.wait_max_ms, waited)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+
+    # Remaining pool events carry nothing we report
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
@@ -1,16 +1,24 @@
 from flask import jsonify
 
 
-def success(message: str, data=None, code: int = 200):
+def success_payload(message: str, data=None, **extra) -> dict:
     payload = {"success": True, "message": message}
     if data is not None:
         payload["data"] = data
-    return jsonify(payload), code
+    payload.update(extra)
+    return payload
 
 
-def error(message: str, code: int = 400, data=None):
+def error_payload(message: str, data=None) -> dict:
     payload = {"success": False, "message": message}
     if data is not None:
         payload["data"] = data
-    return jsonify(payload), code
+    return payload
+
+
+def success(message: str, data=None, code: int = 200, **extra):
+    return jsonify(success_payload(message, data, **extra)), code
 
+
+def error(message: str, code: int = 400, data=None):
+    return jsonify(error_payload(message, data)), code
@@ -0,0 +1,28 @@
+# Fields never sent back to the client; pass as the find() projection so they
+# are not even read off the wire. The token is the caller's own credential and
+# seq is /api/sync bookkeeping.
+EXPENSE_PROJECTION = {"token": 0, "seq": 0}
+SAVINGS_PROJECTION = {"token": 0, "seq": 0}
+# Also internal, but read for keyset cursors, so dropped while serializing
+PRIVATE_FIELDS = ("token", "seq", "occurred_at")
+
+
+def serialize_documents(docs: list) -> list:
+    """Prepare driver documents for the JSON response, in place.
+
+    ``_id`` is renamed to a string ``id`` and PRIVATE_FIELDS are dropped;
+    datetimes and any remaining ObjectIds are encoded by the app's JSON provider.
+    """
+    for doc in docs:
+        if doc.get("_id"):
+            doc["id"] = str(doc.pop("_id"))
+        for field in PRIVATE_FIELDS:
+            doc.pop(field, None)
+    return docs
+
+
+def serialize_document(doc):
+    """Like serialize_documents for one document, leaving ``doc`` untouched."""
+    if not doc:
+        return None
+    return serialize_documents([dict(doc)])[0]
@@ -0,0 +1,202 @@
+"""Slow-operation recorder: logs commands over a latency threshold to Mongo.
+
+A pymongo CommandListener notes every command's collection and the Flask
+route that issued it; anything slower than SLOW_QUERY_MS is handed to a
+background thread, which explains a sample of them and stores the result in
+the ``slow_queries`` collection for ``flask slow-queries report``. Nothing
+slow happens on the request thread: fast commands cost a dict insert and pop.
+"""
+import os
+import queue
+import random
+import threading
+from datetime import datetime
+
+from flask import has_request_context, request
+from pymongo import monitoring
+
+
+SLOW_QUERY_COLLECTION = "slow_queries"
+# Commands at or above this many ms are recorded; 0 disables the recorder
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+# Fraction of recorded commands that also get an explain("executionStats")
+SLOW_QUERY_EXPLAIN_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", "0.1"))
+# docsExamined / nReturned above this is flagged as a poorly selective plan
+SLOW_QUERY_MAX_RATIO = float(os.getenv("SLOW_QUERY_MAX_RATIO", "100"))
+
+EXPLAINABLE = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+# Driver/session fields that explain rejects or that are noise in the log
+_TRANSPORT_FIELDS = {"$db", "lsid", "$clusterTime", "$readPreference", "txnNumber", "autocommit"}
+_MAX_QUEUE = 1000
+
+
+def _stored_command(command: dict) -> dict:
+    """What gets logged: no transport fields, credentials or bulk payloads."""
+    out = {}
+    for k, v in command.items():
+        if k in _TRANSPORT_FIELDS:
+            continue
+        if k in ("documents", "updates", "deletes") and isinstance(v, list):
+            # Bulk writes: keep a couple of statements to show their shape
+            out[f"{k}_count"] = len(v)
+            v = v[:2]
+        out[k] = v
+    return _redact(out)
+
+
+def _redact(value):
+    """Drop user credentials from a command before it is stored."""
+    if isinstance(value, dict):
+        return {k: "?" if k in ("token", "access_token") else _redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redact(v) for v in value]
+    return value
+
+
+def _walk(node, key):
+    """Yield every value stored under ``key`` anywhere in a nested explain."""
+    if isinstance(node, dict):
+        for k, v in node.items():
+            if k == key:
+                yield v
+            yield from _walk(v, key)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _walk(item, key)
+
+
+def summarize_explain(explain: dict) -> dict:
+    """Plan stages and execution counters from find or aggregate explain output."""
+    stages = []
+    for plan in _walk(explain, "winningPlan"):
+        stages.extend(s for s in _walk(plan, "stage") if isinstance(s, str))
+    stats = next(_walk(explain, "executionStats"), {}) or {}
+    docs = stats.get("totalDocsExamined", 0)
+    returned = stats.get("nReturned", 0)
+    ratio = docs / returned if returned else float(docs)
+    flags = []
+    if "COLLSCAN" in stages:
+        flags.append("COLLSCAN")
+    if ratio > SLOW_QUERY_MAX_RATIO:
+        flags.append("HIGH_SCAN_RATIO")
+    return {
+        "stages": stages,
+        "docs_examined": docs,
+        "keys_examined": stats.get("totalKeysExamined", 0),
+        "n_returned": returned,
+        "ratio": round(ratio, 1),
+        "flags": flags,
+    }
+
+
+class SlowQueryRecorder(monitoring.CommandListener):
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS, explain_rate: float = SLOW_QUERY_EXPLAIN_RATE):
+        self.threshold_ms = threshold_ms
+        self.explain_rate = explain_rate
+        self.dropped = 0
+        self._pending = {}
+        self._queue = queue.Queue(maxsize=_MAX_QUEUE)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def started(self, event):
+        command = event.command
+        target = command.get("collection") if event.command_name == "getMore" else command.get(event.command_name)
+        if target == SLOW_QUERY_COLLECTION or event.command_name == "explain":
+            return  # our own writes and explains
+        route = method = None
+        if has_request_context():
+            route, method = request.endpoint, request.method
+        self._pending[(event.connection_id, event.request_id)] = (
+            target if isinstance(target, str) else "", command, event.database_name, route, method,
+        )
+
+    def succeeded(self, event):
+        self._finish(event, error=None)
+
+    def failed(self, event):
+        self._finish(event, error=str(event.failure)[:200])
+
+    def _finish(self, event, error):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        duration_ms = event.duration_micros / 1000
+        if pending is None or duration_ms < self.threshold_ms:
+            return
+        collection, command, database, route, method = pending
+        record = {
+            "at": datetime.utcnow(),
+            "route": route,
+            "method": method,
+            "database": database,
+            "collection": collection,
+            "command_name": event.command_name,
+            "duration_ms": round(duration_ms, 3),
+            "error": error,
+        }
+        explain = event.command_name in EXPLAINABLE and not error and random.random() < self.explain_rate
+        self._submit(record, command, explain)
+
+    def _submit(self, record, command, explain):
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((record, command, explain))
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._worker_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._drain, name="slow-queries", daemon=True)
+                    self._worker.start()
+
+    def _drain(self):
+        from app.config import db
+
+        while True:
+            record, command, explain = self._queue.get()
+            try:
+                record["command"] = _stored_command(command)
+                if explain:
+                    self._explain(db, record, command)
+                db[SLOW_QUERY_COLLECTION].insert_one(record)
+            except Exception as e:
+                print(f"[slow-queries] could not record {record.get('collection')}.{record.get('command_name')}: {e}")
+
+    @staticmethod
+    def _explain(db, record, command):
+        clean = {k: v for k, v in command.items() if k not in _TRANSPORT_FIELDS}
+        try:
+            plan = db.client[record["database"]].command({"explain": clean, "verbosity": "executionStats"})
+        except Exception as e:
+            record["explain_error"] = str(e)[:200]
+            return
+        record["explain"] = summarize_explain(plan)
+        record["flags"] = record["explain"]["flags"]
+
+
+slow_query_recorder = SlowQueryRecorder()
+
+
+def report_pipeline(since: datetime, route: str = None, flagged_only: bool = False, limit: int = 20) -> list:
+    """Slow queries since ``since`` grouped by route, collection and command."""
+    match = {"at": {"$gte": since}}
+    if route:
+        match["route"] = route
+    if flagged_only:
+        match["flags.0"] = {"$exists": True}
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": {"route": "$route", "collection": "$collection", "command": "$command_name"},
+            "count": {"$sum": 1},
+            "total_ms": {"$sum": "$duration_ms"},
+            "max_ms": {"$max": "$duration_ms"},
+            "explained": {"$sum": {"$cond": [{"$ifNull": ["$explain", False]}, 1, 0]}},
+            "collscans": {"$sum": {"$cond": [{"$in": ["COLLSCAN", {"$ifNull": ["$flags", []]}]}, 1, 0]}},
+            "max_ratio": {"$max": "$explain.ratio"},
+            "last_at": {"$max": "$at"},
+        }},
+        {"$sort": {"total_ms": -1}},
+        {"$limit": limit},
+    ]
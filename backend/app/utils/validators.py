@@ -1,25 +1,25 @@
 from datetime import datetime
 
 
-def validate_expense_data(data: dict):
-    if not isinstance(data, dict):
-        return False, "Invalid payload"
+def _check_category(category):
+    if not category or not isinstance(category, str):
+        return "'category' is required and must be a string"
+    return None
 
-    category = data.get("category")
-    amount = data.get("amount")
-    date = data.get("date")
 
-    if not category or not isinstance(category, str):
-        return False, "'category' is required and must be a string"
+def _check_amount(amount):
     try:
         amount_val = float(amount)
     except (TypeError, ValueError):
-        return False, "'amount' is required and must be a number"
+        return "'amount' is required and must be a number"
     if amount_val < 0:
-        return False, "'amount' must be >= 0"
+        return "'amount' must be >= 0"
+    return None
+
 
+def _check_date(date):
     if not date or not isinstance(date, str):
-        return False, "'date' is required and must be an ISO string"
+        return "'date' is required and must be an ISO string"
     # Basic ISO format check
     try:
         # Accept both date and datetime strings
@@ -28,12 +28,49 @@ def validate_expense_data(data: dict):
         else:
             datetime.fromisoformat(date)
     except Exception:
-        return False, "'date' must be an ISO format string"
+        return "'date' must be an ISO format string"
+    return None
 
+
+def _check_description(desc):
     # Optional description
-    desc = data.get("description")
     if desc is not None and not isinstance(desc, str):
-        return False, "'description' must be a string if provided"
+        return "'description' must be a string if provided"
+    return None
+
+
+_FIELD_CHECKS = {
+    "category": _check_category,
+    "amount": _check_amount,
+    "date": _check_date,
+    "description": _check_description,
+}
+
+
+def validate_expense_data(data: dict):
+    if not isinstance(data, dict):
+        return False, "Invalid payload"
+
+    for field, check in _FIELD_CHECKS.items():
+        err = check(data.get(field))
+        if err:
+            return False, err
 
     return True, None
 
+
+def validate_expense_updates(updates: dict):
+    """Validate only the fields present in a partial update.
+
+    Every field is self-contained, so the stored document is not needed.
+    """
+    if not isinstance(updates, dict):
+        return False, "Invalid payload"
+
+    for field, check in _FIELD_CHECKS.items():
+        if field in updates:
+            err = check(updates[field])
+            if err:
+                return False, err
+
+    return True, None
@@ -0,0 +1,114 @@
+import hashlib
+import os
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import g, has_app_context, make_response, request
+from pymongo import ReturnDocument
+
+
+# Every write path bumps the caller's counter in data_versions; read endpoints
+# tag responses with it so unchanged data can be answered with 304.
+#
+# begin_change bumps the version before its write lands, so for this long
+# after a change responses go out untagged: a body read in between could
+# otherwise be cached under the new version without the write in it.
+CHANGE_SETTLE_SECONDS = float(os.getenv("CHANGE_SETTLE_SECONDS", "5"))
+
+
+def bump_version(token: str):
+    """Bump the version after a write that needs no sync sequence (repairs)."""
+    from app.config import db
+
+    db.data_versions.update_one({"token": token}, {"$inc": {"v": 1}}, upsert=True)
+
+
+def get_version(token: str):
+    """The user's data version, or None while a change may still be landing."""
+    from app.config import db
+
+    record = db.data_versions.find_one({"token": token}, {"_id": 0, "v": 1, "changed_at": 1})
+    return version_of(record)
+
+
+def version_of(record):
+    if not record:
+        return 0
+    changed_at = record.get("changed_at")
+    if changed_at and datetime.utcnow() - changed_at < timedelta(seconds=CHANGE_SETTLE_SECONDS):
+        return None
+    return record.get("v", 0)
+
+
+def begin_change(token: str):
+    """Allocate the next /api/sync sequence number and bump the version together.
+
+    One round trip per write: the returned ``seq`` is stored on the written
+    documents and sent with the change event; ``v`` is the new data version.
+    Returns (seq, v).
+    """
+    from app.config import db
+
+    record = db.data_versions.find_one_and_update(
+        {"token": token},
+        {"$inc": {"seq": 1, "v": 1}, "$set": {"changed_at": datetime.utcnow()}},
+        projection={"_id": 0, "seq": 1, "v": 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return record["seq"], record["v"]
+
+
+def current_change_seq(token: str) -> int:
+    from app.config import db
+
+    record = db.data_versions.find_one({"token": token}, {"_id": 0, "seq": 1})
+    return (record or {}).get("seq", 0)
+
+
+def request_version(token: str):
+    """The data version ``conditional`` tagged this request's response with, or None.
+
+    Lets caches serve only entries read at that version, so a body is never
+    older than the ETag it goes out under.
+    """
+    if has_app_context() and g.get("token") == token:
+        return g.get("data_version")
+    return None
+
+
+def compute_etag(full_path: str, version: int) -> str:
+    # The full path carries the endpoint and every query param (period, limit,
+    # after...); the UTC day rolls period-based summaries over at midnight
+    raw = f"{full_path}|{version}|{datetime.utcnow().date()}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def conditional(view):
+    """Answer GETs with 304 when If-None-Match matches the user's data version.
+
+    The version is read before the view runs, so a write racing with the
+    query can only make the tag older than the body, never newer. Within
+    CHANGE_SETTLE_SECONDS of a change the response is sent untagged.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = g.get("token")
+        if not token:
+            return view(*args, **kwargs)
+
+        g.data_version = get_version(token)
+        if g.data_version is None:
+            return view(*args, **kwargs)
+        etag = compute_etag(request.full_path, g.data_version)
+        if etag in request.if_none_match:
+            resp = make_response("", 304)
+        else:
+            resp = make_response(view(*args, **kwargs))
+            if resp.status_code != 200:
+                return resp
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "private, no-cache"
+        return resp
+
+    return wrapper
@@ -0,0 +1,89 @@
+"""Compare the sync (Flask) and async (ASGI) serving modes on the read endpoints.
+
+Start both servers against the same database, then point this script at them:
+
+    python run.py                                   # sync, port 5000
+    uvicorn asgi:app --port 8000 --workers 1        # async
+    python benchmarks/async_vs_sync.py --token <token> \\
+        --sync http://localhost:5000 --async http://localhost:8000
+
+Each endpoint is hit ``--requests`` times by ``--concurrency`` client threads;
+throughput and latency percentiles are printed per mode.
+"""
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+ENDPOINTS = [
+    "/api/expenses/list?token={token}",
+    "/api/expenses/summary?token={token}&period=month",
+    "/api/savings/get?token={token}",
+    "/api/savings/summary?token={token}",
+    "/api/settings/get?token={token}",
+    "/api/analytics?token={token}&chart_type=line&period=month",
+]
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def _timed_get(url: str):
+    start = time.perf_counter()
+    resp = _session().get(url, timeout=30)
+    return time.perf_counter() - start, resp.status_code
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(base_url: str, path: str, total: int, concurrency: int) -> dict:
+    url = base_url.rstrip("/") + path
+    _timed_get(url)  # warm up connections and caches
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(_timed_get, [url] * total))
+        elapsed = time.perf_counter() - start
+    latencies = [r[0] * 1000 for r in results]
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": _percentile(latencies, 95),
+        "p99": _percentile(latencies, 99),
+        "errors": sum(1 for _, status in results if status != 200),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sync", dest="sync_url", default="http://localhost:5000")
+    parser.add_argument("--async", dest="async_url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="user token with some data")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<45} {'mode':<6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}")
+    for template in ENDPOINTS:
+        path = template.format(token=args.token)
+        for mode, base in (("sync", args.sync_url), ("async", args.async_url)):
+            r = run(base, path, args.requests, args.concurrency)
+            print(
+                f"{path.split('?')[0]:<45} {mode:<6} {r['rps']:>8.1f} {r['p50']:>8.1f} "
+                f"{r['p95']:>8.1f} {r['p99']:>8.1f} {r['errors']:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""Time every API route against a seeded database and save the results as JSON.
+
+From the backend directory:
+
+    # against a local mongod (uses DB_NAME=expense_tracker_bench unless set)
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.endpoints --users 20 --expenses 5000
+
+    # in-memory, no server needed (CI); documents examined is not available
+    python -m benchmarks.endpoints --mongomock --users 5 --expenses 500
+
+    # compare against an earlier run
+    python -m benchmarks.endpoints --output after.json --compare before.json
+
+Requests go through Flask's test client, so the numbers are handler + database
+time without HTTP overhead. "docs_examined" is the per-request delta of the
+server's queryExecutor.scannedObjects counter, so run on an otherwise idle mongod.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Keep benchmark data out of the development database by default
+os.environ.setdefault("DB_NAME", "expense_tracker_bench")
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+
+# Routes that cannot run offline; reported as skipped rather than silently missing
+SKIPPED = {
+    "static": "static files",
+    "auth_bp.google_auth": "verifies a live Google credential",
+    "auth_bp.auth_login": "verifies a live Google credential",
+    "google_auth_bp.login": "redirects to Google",
+    "google_auth_bp.callback": "exchanges a code with Google",
+    "events.events": "long-lived stream; measured by open connections, not latency",
+}
+# Cases mongomock cannot serve, added to SKIPPED under --mongomock
+MONGOMOCK_SKIPPED = {
+    "expenses.search": "$text is not implemented in mongomock",
+    "expenses.search.filtered": "$text is not implemented in mongomock",
+}
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def scan_counters(db):
+    """(docs, keys) examined so far on the server, or None if unsupported."""
+    try:
+        executor = db.command("serverStatus")["metrics"]["queryExecutor"]
+        return executor["scannedObjects"], executor["scanned"]
+    except Exception:
+        return None
+
+
+def build_cases(db, tokens: list, iterations: int) -> list:
+    """Return the (name, endpoint, prepare) cases in run order, plus the list
+    the expenses.add case fills with (token, id) pairs for expenses.delete.
+
+    ``prepare(i)`` runs untimed and returns the test-client call as
+    (method, url, kwargs).
+    """
+    ids = {
+        t: [str(d["_id"]) for d in db.expenses.find({"token": t}, {"_id": 1}).limit(iterations)]
+        for t in tokens
+    }
+    created = []
+
+    def user(i):
+        return tokens[i % len(tokens)]
+
+    def expense_body(i):
+        return {"token": user(i), "category": "Food", "amount": 12.5, "date": "2026-01-15",
+                "description": f"bench {i}"}
+
+    def add_expense(i):
+        return "post", "/api/expenses/add", {"json": expense_body(i)}
+
+    def delete_expense(i):
+        token, expense_id = created[i % len(created)] if created else (user(i), "000000000000000000000000")
+        return "delete", f"/api/expenses/delete/{expense_id}?token={token}", {}
+
+    def update_expense(i):
+        token = user(i)
+        pool = ids[token] or ["000000000000000000000000"]
+        return "put", f"/api/expenses/update/{pool[i % len(pool)]}", {"json": {"token": token, "amount": 20 + i % 7}}
+
+    def import_ndjson(i):
+        rows = "\n".join(json.dumps({"category": "Misc", "amount": 1 + n, "date": "2026-02-01"}) for n in range(100))
+        return "post", f"/api/expenses/import?token={user(i)}&format=ndjson", {"data": rows.encode()}
+
+    def reset(i):
+        token = f"bench_reset_{i}"
+        client.post(f"/api/expenses/import?token={token}&format=ndjson",
+                    data="\n".join(json.dumps({"category": "Misc", "amount": 1, "date": "2026-02-01"})
+                                   for _ in range(50)).encode())
+        return "post", "/api/admin/reset", {"json": {"token": token}}
+
+    def job(action):
+        def case(i):
+            token = f"bench_reset_{i}"
+            job_id = client.post("/api/admin/reset", json={"token": token}).get_json()["data"]["id"]
+            if action == "cancel":
+                return "post", f"/api/jobs/{job_id}/cancel?token={token}", {}
+            return "get", f"/api/jobs/{job_id}?token={token}", {}
+
+        return case
+
+    def sync(i):
+        # A cursor from a minute ago: only the overlap window is re-read
+        from app.services.sync_service import encode_sync_cursor
+
+        since = encode_sync_cursor(0, datetime.utcnow() - timedelta(minutes=1))
+        return "get", f"/api/sync?token={user(i)}&since={since}", {}
+
+    def get(path):
+        return lambda i: ("get", path.format(token=user(i)), {})
+
+    def post(path, body):
+        return lambda i: ("post", path, {"json": {"token": user(i), **body}})
+
+    return [
+        ("home", "main_routes.home", get("/")),
+        ("healthz", "main_routes.healthz", get("/healthz")),
+        ("readyz", "main_routes.readyz", get("/readyz")),
+        ("metrics", "main_routes.metrics", get("/metrics")),
+        ("expenses.list", "expense_routes.list_expenses", get("/api/expenses/list?token={token}&limit=50")),
+        ("expenses.summary", "expense_routes.summary", get("/api/expenses/summary?token={token}&period=month")),
+        ("expenses.search", "expense_routes.search",
+         get("/api/expenses/search?token={token}&q=uber+ride&limit=50")),
+        ("expenses.search.filtered", "expense_routes.search",
+         get("/api/expenses/search?token={token}&q=coffee&min_amount=10&max_amount=100&sort=date&limit=50")),
+        ("expenses.export", "expense_routes.export", get("/api/expenses/export?token={token}&format=csv")),
+        ("savings.get", "savings_routes.savings_get", get("/api/savings/get?token={token}&limit=50")),
+        ("savings.summary", "savings_routes.savings_summary", get("/api/savings/summary?token={token}")),
+        ("savings.export", "savings_routes.savings_export", get("/api/savings/export?token={token}&format=csv")),
+        ("settings.get", "settings.get_settings", get("/api/settings/get?token={token}")),
+        ("analytics.line", "analytics.analytics", get("/api/analytics?token={token}&chart_type=line&period=month")),
+        ("analytics.pie", "analytics.analytics", get("/api/analytics?token={token}&chart_type=pie&period=year")),
+        ("dashboard", "dashboard.dashboard", get("/api/dashboard?token={token}&period=month")),
+        ("sync", "sync.sync", sync),
+        ("expenses.add", "expense_routes.add", add_expense),
+        ("expenses.update", "expense_routes.update", update_expense),
+        ("expenses.delete", "expense_routes.delete", delete_expense),
+        ("expenses.import", "expense_routes.import_bulk", import_ndjson),
+        ("savings.add", "savings_routes.savings_add", post("/api/savings/add", {"amount": 10})),
+        ("savings.use", "savings_routes.savings_use", post("/api/savings/use", {"amount": 5, "category": "Misc"})),
+        ("settings.save", "settings.save_settings", post("/api/settings/save", {"budget": 3000, "income": 5000})),
+        ("profile.update", "profile_bp.update_profile", post("/api/profile/update", {"name": "Bench User"})),
+        ("admin.reset", "admin.reset_user_data", reset),
+        ("jobs.list", "jobs.jobs_list", get("/api/jobs?token={token}")),
+        ("jobs.get", "jobs.job_status", job("get")),
+        ("jobs.cancel", "jobs.job_cancel", job("cancel")),
+    ], created
+
+
+def run_case(prepare, iterations: int, db, on_response=None) -> dict:
+    latencies, errors = [], 0
+    before = scan_counters(db)
+    for i in range(iterations):
+        method, url, kwargs = prepare(i)
+        start = time.perf_counter()
+        resp = getattr(client, method)(url, **kwargs)
+        resp.get_data()  # drain streamed bodies (exports) inside the timing
+        latencies.append((time.perf_counter() - start) * 1000)
+        if resp.status_code >= 400:
+            errors += 1
+        elif on_response:
+            on_response(resp, kwargs)
+    after = scan_counters(db)
+
+    result = {
+        "iterations": iterations,
+        "errors": errors,
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "docs_examined": None,
+        "keys_examined": None,
+    }
+    if before and after:
+        result["docs_examined"] = round((after[0] - before[0]) / iterations, 1)
+        result["keys_examined"] = round((after[1] - before[1]) / iterations, 1)
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(results: dict, baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    print(f"\nvs {baseline_path}")
+    print(f"{'route':<18} {'p50 before':>11} {'p50 after':>10} {'change':>8} {'p95 before':>11} {'p95 after':>10}")
+    for name, r in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        change = (r["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100 if old["p50_ms"] else 0
+        print(f"{name:<18} {old['p50_ms']:>11.2f} {r['p50_ms']:>10.2f} {change:>+7.1f}% "
+              f"{old['p95_ms']:>11.2f} {r['p95_ms']:>10.2f}")
+
+
+def main():
+    global client
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongomock", action="store_true", help="run against in-memory mongomock")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--expenses", type=int, default=1000, help="expenses per user")
+    parser.add_argument("--savings", type=int, default=100, help="savings entries per user")
+    parser.add_argument("--iterations", type=int, default=200, help="requests per route")
+    parser.add_argument("--no-seed", action="store_true", help="reuse the previously seeded data")
+    parser.add_argument("--only", default=None, help="comma separated route names to run")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", default=None, help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    if args.mongomock:
+        import mongomock
+        import pymongo
+
+        pymongo.MongoClient = mongomock.MongoClient
+        SKIPPED.update(MONGOMOCK_SKIPPED)
+
+    from app import create_app
+    from app.config import db
+    from benchmarks.seed import bench_tokens, clear, seed
+
+    app = create_app()
+    client = app.test_client()
+
+    if args.no_seed:
+        tokens = bench_tokens(args.users)
+    else:
+        start = time.perf_counter()
+        clear(db)
+        tokens = seed(db, args.users, args.expenses, args.savings)
+        print(f"Seeded {args.users} users x ({args.expenses} expenses, {args.savings} savings) "
+              f"in {time.perf_counter() - start:.1f}s")
+
+    cases, created = build_cases(db, tokens, args.iterations)
+    covered = {endpoint for _, endpoint, _ in cases}
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint not in covered and rule.endpoint not in SKIPPED:
+            print(f"WARNING: no benchmark case for {rule.endpoint} ({rule.rule})")
+    only = set(args.only.split(",")) if args.only else None
+
+    def remember_created(resp, kwargs):
+        # Responses no longer carry the token; take it from the request body
+        created.append((kwargs["json"]["token"], resp.get_json()["data"]["id"]))
+
+    results = {}
+    print(f"{'route':<18} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'docs/req':>9} {'errors':>6}")
+    for name, _, prepare in cases:
+        if (only and name not in only) or name in SKIPPED:
+            continue
+        hook = remember_created if name == "expenses.add" else None
+        r = results[name] = run_case(prepare, args.iterations, db, hook)
+        docs = "-" if r["docs_examined"] is None else f"{r['docs_examined']:.1f}"
+        print(f"{name:<18} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {docs:>9} {r['errors']:>6}")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "backend": "mongomock" if args.mongomock else "mongod",
+            "python": platform.python_version(),
+            "users": args.users,
+            "expenses_per_user": args.expenses,
+            "savings_per_user": args.savings,
+            "iterations": args.iterations,
+            "skipped": SKIPPED,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+client = None
+
+if __name__ == "__main__":
+    sys.exit(main())
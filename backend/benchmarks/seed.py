@@ -0,0 +1,85 @@
+"""Synthetic dataset for benchmarks: users with expenses, savings and settings.
+
+Documents are built with the app's own model functions so they match what the
+API writes, inserted with insert_many in batches, and the derived collections
+(daily_rollups, savings_balances) are rebuilt from them afterwards.
+"""
+import random
+from datetime import datetime, timedelta
+
+from app.models.expense_model import new_expense_document
+from app.models.savings_model import new_savings_document
+
+CATEGORIES = ("Food", "Transport", "Rent", "Utilities", "Shopping", "Health", "Travel", "Misc")
+# Description words give the text search index realistic term frequencies
+DESCRIPTION_WORDS = (
+    "uber", "ride", "taxi", "coffee", "lunch", "dinner", "groceries", "market", "rent", "electricity",
+    "water", "internet", "phone", "pharmacy", "doctor", "gym", "flight", "hotel", "books", "gift",
+    "train", "fuel", "parking", "cinema", "shoes", "laptop", "repair", "insurance", "bakery", "pizza",
+)
+TOKEN_PREFIX = "bench_u"
+
+
+def bench_tokens(users: int) -> list:
+    return [f"{TOKEN_PREFIX}{i:05d}" for i in range(users)]
+
+
+def _flush(collection, batch: list):
+    if batch:
+        collection.insert_many(batch, ordered=False)
+        batch.clear()
+
+
+def clear(db):
+    """Remove everything a previous benchmark run left behind (bench_* tokens)."""
+    q = {"token": {"$regex": "^bench_"}}
+    for name in ("expenses", "savings", "settings", "profiles", "daily_rollups", "savings_balances",
+                 "data_versions", "tombstones", "jobs"):
+        db[name].delete_many(q)
+
+
+def seed(db, users: int = 10, expenses_per_user: int = 1000, savings_per_user: int = 100,
+         days: int = 365, batch_size: int = 5000, rng_seed: int = 42) -> list:
+    """Insert a reproducible dataset and return the seeded user tokens."""
+    from app.services.rollup_service import rebuild_rollups
+    from app.services.savings_service import reconcile_balances
+
+    rng = random.Random(rng_seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    tokens = bench_tokens(users)
+    expenses, savings = [], []
+
+    for token in tokens:
+        for _ in range(expenses_per_user):
+            when = now - timedelta(seconds=rng.randrange(days * 86400))
+            doc = new_expense_document(token, {
+                "category": rng.choice(CATEGORIES),
+                "amount": round(rng.uniform(1, 250), 2),
+                "description": " ".join(rng.sample(DESCRIPTION_WORDS, rng.randint(1, 4))),
+                "date": when.date().isoformat(),
+            })
+            doc["created_at"] = doc["updated_at"] = when
+            expenses.append(doc)
+            if len(expenses) >= batch_size:
+                _flush(db.expenses, expenses)
+
+        for _ in range(savings_per_user):
+            when = now - timedelta(seconds=rng.randrange(days * 86400))
+            kind = "add" if rng.random() < 0.75 else "use"
+            doc = new_savings_document(token, round(rng.uniform(5, 200), 2), kind)
+            doc["date"] = doc["occurred_at"] = when
+            savings.append(doc)
+            if len(savings) >= batch_size:
+                _flush(db.savings, savings)
+
+    _flush(db.expenses, expenses)
+    _flush(db.savings, savings)
+    db.settings.insert_many([
+        {"token": t, "income": 5000, "budget": 3000, "currency": "$", "updated_at": now}
+        for t in tokens
+    ], ordered=False)
+
+    for token in tokens:
+        rebuild_rollups(token)
+        reconcile_balances(token, fix=True)
+    return tokens
@@ -0,0 +1,99 @@
+"""Measure list-response encoding: per-document helpers + stdlib vs bulk + provider.
+
+    python benchmarks/serialization.py --docs 10000 --rounds 20
+
+"legacy" reproduces the old path (copy each dict, convert _id and datetimes in
+Python, encode with Flask's default provider); "bulk" is serialize_documents
+with the token projected away, encoded by MongoJSONProvider.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.utils.json_provider import MongoJSONProvider, orjson  # noqa: E402
+from app.utils.serializers import serialize_documents  # noqa: E402
+
+
+def make_docs(n: int, with_token: bool = True) -> list:
+    base = datetime(2026, 1, 1, 12, 0, 0, 123000)
+    docs = []
+    for i in range(n):
+        ts = base + timedelta(minutes=i)
+        doc = {
+            "_id": ObjectId(),
+            "category": ("Food", "Travel", "Rent", "Misc")[i % 4],
+            "amount": float(i % 500) + 0.25,
+            "description": f"expense {i}",
+            "date": ts.date().isoformat(),
+            "occurred_at": ts,
+            "recovered_from_savings": False,
+            "created_at": ts,
+            "updated_at": ts,
+        }
+        if with_token:
+            doc["token"] = "u_0123456789abcdef0123456789abcdef"
+        docs.append(doc)
+    return docs
+
+
+def legacy_serialize(exp):
+    out = dict(exp)
+    if out.get("_id"):
+        out["id"] = str(out.pop("_id"))
+    for k in ("created_at", "updated_at", "occurred_at"):
+        if isinstance(out.get(k), datetime):
+            out[k] = out[k].isoformat()
+    return out
+
+
+def timed(fn, make_input, rounds: int) -> list:
+    samples = []
+    for _ in range(rounds):
+        data = make_input()  # serializers mutate in place, so build fresh input
+        start = time.perf_counter()
+        fn(data)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    legacy_json = DefaultJSONProvider(app)
+    fast_json = MongoJSONProvider(app)
+
+    def legacy(docs):
+        items = [legacy_serialize(e) for e in docs]
+        return legacy_json.response({"success": True, "data": items}).get_data()
+
+    def bulk(docs):
+        items = serialize_documents(docs)
+        return fast_json.response({"success": True, "data": items}).get_data()
+
+    print(f"{args.docs} docs, {args.rounds} rounds, orjson={'yes' if orjson else 'no'}")
+    cases = (
+        ("legacy", legacy, lambda: make_docs(args.docs)),
+        ("bulk", bulk, lambda: make_docs(args.docs, with_token=False)),
+    )
+    for name, fn, make_input in cases:
+        samples = timed(fn, make_input, args.rounds)
+        size = len(fn(make_input())) / 1024
+        print(f"{name:<7} median {statistics.median(samples):8.1f} ms   "
+              f"p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:8.1f} ms   body {size:8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,3 +15,18 @@ export async function apiFetch(path, options = {}) {
   const url = `${apiBase}${path.startsWith('/') ? '' : '/'}${path}`
   return fetch(url, opts)
 }
+
+// Poll a background job (/api/jobs/<id>) until it finishes; resolves with the job
+// on success and throws with its error otherwise.
+export async function waitForJob(jobId, token, { interval = 1000 } = {}) {
+  for (;;) {
+    const res = await apiFetch(`/api/jobs/${jobId}?token=${encodeURIComponent(token)}`)
+    const body = await res.json()
+    if (!res.ok) throw new Error(body?.message || 'Failed to check job status')
+    const job = body.data
+    if (job.status === 'succeeded') return job
+    if (job.status === 'failed') throw new Error(job.error || 'Job failed')
+    if (job.status === 'cancelled') throw new Error('Job was cancelled')
+    await new Promise((resolve) => setTimeout(resolve, interval))
+  }
+}
@@ -7,7 +7,7 @@ import { useTheme } from '../context/ThemeContext'
 import AnimatedCheckbox from '../components/ui/AnimatedCheckbox'
 import PurpleDropdown from '../components/ui/PurpleDropdown'
 import LoadingButton from '../components/common/LoadingButton'
-import { apiFetch } from '../lib/api'
+import { apiFetch, waitForJob } from '../lib/api'
 
 export default function Settings() {
   const navigate = useNavigate()
@@ -99,12 +99,15 @@ export default function Settings() {
     setResetting(true)
     try {
       const token = localStorage.getItem('token')
-      // 1) Clear backend data for this user
-      await apiFetch('/api/admin/reset', {
+      // 1) Clear backend data for this user; runs as a background job
+      const res = await apiFetch('/api/admin/reset', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ token })
       })
+      const body = await res.json()
+      if (!res.ok) throw new Error(body?.message || 'Failed to reset')
+      await waitForJob(body.data.id, token)
       // 2) Persist 0 income/budget and false notifications
       const zeros = { income: 0, budget: 0, notifications: { budgetAlert: false, largeExpense: false, monthlyEmail: false }, currency }
       await saveSettingsToAPI(zeros, token)